@@ -1,57 +1,128 @@
 import base64
 import csv
+import hashlib
 import io
+import json
+import mimetypes
 import os
+import zipfile
 from datetime import datetime, timezone, timedelta
-from functools import wraps
+from functools import partial, wraps
 from typing import List, Optional
 
+import click
 from dotenv import load_dotenv
 from flask import (
     Flask,
+    Response,
     abort,
     flash,
+    g,
+    jsonify,
     make_response,
     redirect,
     render_template,
     request,
     send_file,
+    send_from_directory,
     session,
+    stream_with_context,
     url_for,
 )
-from PIL import Image
-import qrcode
-from qrcode.constants import ERROR_CORRECT_Q
-from weasyprint import HTML
+from werkzeug.security import safe_join
 from werkzeug.utils import secure_filename
 from flask_wtf.csrf import generate_csrf
+from jinja2 import FileSystemBytecodeCache
+from bson import ObjectId
 
+from assets import DIST_DIR, build_static_assets, file_hash, fingerprinted_filename, static_file_hash
+from auction import AuctionFinalizer, finalize_due_lions
+from bid_ingest import BidIngestor
 from db import (
+    LION_PAGE_SORTS,
+    DATABASE_FAILURES,
+    LION_DETAIL_BID_LIMIT,
+    MONGODB_MAX_STALENESS_SECONDS,
+    DatabaseUnavailable,
     add_lion_images,
+    backfill_bid_lion_ids,
     clear_database,
+    clear_stale_flag,
+    database_available,
     delete_bid,
     delete_lion,
     delete_lion_image,
+    ensure_indexes,
+    finalize_lion,
+    find_lion_image_by_hash,
+    get_auction_result,
     get_bid_by_id,
+    get_bid_statistics,
     get_bids,
+    get_bids_for_lion,
     get_lion_by_id,
+    get_lion_houses,
     get_lion_image_file,
     get_lion_images,
     get_lions,
-    get_lions_by_bid,
+    get_lions_changing_status,
+    get_lions_page,
     get_max_bid_for_lion,
+    get_next_status_transition,
+    get_top_bid,
+    get_total_raised,
     insert_bid,
     insert_lion,
+    lion_status,
+    reconcile_current_bids,
+    reopen_lion,
+    reset_read_routing,
+    route_reads_to_secondaries,
+    search_lions,
+    served_stale_data,
+    set_lion_current_bid,
     update_lion,
     update_lion_current_bid,
 )
-from forms import AdminLionForm, AdminLoginForm, LionBidForm
+from forms import AdminLionForm, AdminLionImportForm, AdminLoginForm, LionBidForm
+from leaderboard import Leaderboard
+from lion_import import import_lions, read_lion_rows
+from media import compress_image, render_pdf, render_qr_png, render_qr_svg
+from profiler import RequestProfiler
 
 load_dotenv()
 
 app = Flask(__name__)
 app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", "dev-secret-key")
 
+
+class BestEffortBytecodeCache(FileSystemBytecodeCache):
+    """Creates its directory on first write and skips reads or writes it cannot make.
+
+    On a read-only deploy, templates precompiled at build time still load
+    from the cache; anything else compiles in memory as usual.
+    """
+
+    def load_bytecode(self, bucket):
+        try:
+            super().load_bytecode(bucket)
+        except OSError:
+            pass
+
+    def dump_bytecode(self, bucket):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            super().dump_bytecode(bucket)
+        except OSError:
+            pass
+
+
+# Compiled templates are cached on disk and shared by every worker and restart;
+# an empty value disables the cache. Entries are keyed on the template source.
+JINJA_BYTECODE_CACHE_DIR = os.environ.get("JINJA_BYTECODE_CACHE_DIR", os.path.join(app.root_path, ".jinja_cache"))
+if JINJA_BYTECODE_CACHE_DIR:
+    app.jinja_options = {**app.jinja_options, "bytecode_cache": BestEffortBytecodeCache(JINJA_BYTECODE_CACHE_DIR)}
+
 HKT_TZ = timezone(timedelta(hours=8))
 ADMIN_USERNAME = os.environ.get("ADMIN_USERNAME", "admin")
 ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD", "harrow-lion-2026")
@@ -59,6 +130,44 @@ TRAIL_RESET_PIN = os.environ.get("TRAIL_RESET_PIN", "harrow2026")
 ALLOWED_LION_IMAGE_EXTENSIONS = {"jpg", "jpeg", "png", "gif", "webp"}
 MAX_LION_IMAGE_DIM = int(os.environ.get("MAX_LION_IMAGE_DIM", "1600"))
 LION_IMAGE_QUALITY = int(os.environ.get("LION_IMAGE_QUALITY", "80"))
+LION_IMAGE_EFFORT = int(os.environ.get("LION_IMAGE_EFFORT", "6"))
+TRAIL_STATIC_ASSETS = (
+    "css/output.css",
+    "js/trail.js",
+    "js/qr-worker.js",
+    "js/vendor/jsQR.js",
+    "images/map.jpeg",
+    "images/favicon.ico",
+)
+CATALOG_PAGE_SIZE = int(os.environ.get("CATALOG_PAGE_SIZE", "24"))
+HOME_SPOTLIGHT_SIZE = int(os.environ.get("HOME_SPOTLIGHT_SIZE", "6"))
+ADMIN_DASHBOARD_BID_LIMIT = int(os.environ.get("ADMIN_DASHBOARD_BID_LIMIT", "500"))
+CLOSED_LION_CACHE_SECONDS = int(os.environ.get("CLOSED_LION_CACHE_SECONDS", "86400"))
+# 0 disables caching of catalogue pages; otherwise they expire at the next open/close.
+PUBLIC_PAGE_CACHE_SECONDS = int(os.environ.get("PUBLIC_PAGE_CACHE_SECONDS", "0"))
+# Set after a bid so the bidder's next page views read from the primary.
+PRIMARY_READS_COOKIE = "read_primary"
+BIDDING_UNAVAILABLE_MESSAGE = "Bidding is temporarily unavailable. Your bid was not placed; please try again in a minute."
+BID_UNCONFIRMED_MESSAGE = (
+    "We couldn't confirm your bid in time; it may still have been placed. "
+    "Please check the bids on this page in a minute before bidding again."
+)
+BID_RECEIVED_DELAYED_MESSAGE = "Your bid was received. It may take a minute to show on this page, so please don't bid again."
+
+# Started by the first request each worker serves, so CLI commands, scripts and
+# a preloading master never run the polling thread.
+AUCTION_FINALIZER_ENABLED = os.environ.get("AUCTION_FINALIZER_ENABLED", "1") == "1"
+finalizer = AuctionFinalizer()
+
+# "batched" group-commits bids from concurrent requests; "direct" writes each bid inline.
+BID_INGEST_MODE = os.environ.get("BID_INGEST_MODE", "direct")
+bid_ingestor = (
+    BidIngestor(repair_current_bid=finalizer.repair_current_bid if AUCTION_FINALIZER_ENABLED else None)
+    if BID_INGEST_MODE == "batched"
+    else None
+)
+leaderboard = Leaderboard()
+profiler = RequestProfiler()
 
 
 def ensure_utc_datetime(value: Optional[datetime]) -> Optional[datetime]:
@@ -93,15 +202,71 @@ def normalize_lion_time_fields(lion: Optional[dict]) -> Optional[dict]:
 
 
 def is_bidding_window_open(lion: dict, reference_time: Optional[datetime] = None) -> bool:
+    return lion_status(lion.get("bidding_starts_at"), lion.get("bidding_ends_at"), reference_time) == "open"
+
+
+def is_bidding_closed(lion: dict, reference_time: Optional[datetime] = None) -> bool:
+    return lion_status(lion.get("bidding_starts_at"), lion.get("bidding_ends_at"), reference_time) == "closed"
+
+
+def lion_status_changes_at(lion: dict, reference_time: Optional[datetime] = None) -> Optional[datetime]:
+    """When this lion next opens or closes, or None once it has closed."""
     reference_time = reference_time or datetime.now(timezone.utc)
-    starts_at = ensure_utc_datetime(lion.get("bidding_starts_at"))
-    ends_at = ensure_utc_datetime(lion.get("bidding_ends_at"))
+    for field in ("bidding_starts_at", "bidding_ends_at"):
+        value = ensure_utc_datetime(lion.get(field))
+        if value and value > reference_time:
+            return value
+    return None
 
-    if starts_at and reference_time < starts_at:
-        return False
-    if ends_at and reference_time > ends_at:
-        return False
-    return True
+
+def get_or_finalize_result(lion: dict, reference_time: Optional[datetime] = None) -> Optional[dict]:
+    """Return the frozen result for a closed lion, finalizing it if the scheduler has not yet."""
+    if not is_bidding_closed(lion, reference_time):
+        return None
+    result = get_auction_result(str(lion["_id"])) if lion.get("finalized_at") else None
+    if result or served_stale_data():
+        # Without a database, show the live view from the snapshot rather than finalize.
+        return result
+    # A lagging secondary may not have the finalizer's writes yet; check the primary first.
+    token = route_reads_to_secondaries(False)
+    try:
+        lion = get_lion_by_id(str(lion["_id"])) or lion
+        result = get_auction_result(str(lion["_id"])) if lion.get("finalized_at") else None
+        return result or finalize_lion(lion)
+    finally:
+        reset_read_routing(token)
+
+
+def invalidate_lion_result(lion_id: str) -> None:
+    reopen_lion(lion_id)
+    finalizer.wake()
+
+
+def closed_lion_cache_headers(response, shared: bool = True):
+    """Closed results no longer change; pages carrying session content stay in the browser cache only."""
+    scope = "public" if shared else "private"
+    response.headers["Cache-Control"] = f"{scope}, max-age={CLOSED_LION_CACHE_SECONDS}"
+    return response
+
+
+def status_cache_headers(response, max_age: int = PUBLIC_PAGE_CACHE_SECONDS, shared: bool = True):
+    """Cache for up to ``max_age`` seconds, but never past the next lion opening or closing.
+
+    Pass ``shared=False`` for full pages: base.html renders flashes, admin
+    links and the data-delayed banner, so only the browser may keep them.
+    """
+    if max_age <= 0:
+        return response
+    now = datetime.now(timezone.utc)
+    try:
+        next_transition = ensure_utc_datetime(get_next_status_transition(now))
+    except DatabaseUnavailable:
+        return response
+    if next_transition:
+        max_age = min(max_age, max(int((next_transition - now).total_seconds()), 0))
+    scope = "public" if shared else "private"
+    response.headers["Cache-Control"] = f"{scope}, max-age={max_age}"
+    return response
 
 
 def admin_is_authenticated() -> bool:
@@ -194,6 +359,7 @@ def extract_lion_uploads(form: AdminLionForm) -> List[dict]:
     if not isinstance(files, list):
         files = [files]
 
+    seen_hashes = set()
     for storage in files:
         if not storage or not getattr(storage, "filename", ""):
             continue
@@ -204,86 +370,100 @@ def extract_lion_uploads(form: AdminLionForm) -> List[dict]:
         content = storage.read()
         if not content:
             continue
-        compressed_content, content_type, extension = compress_lion_image(content)
-        base_name = os.path.splitext(filename)[0] or "lion-image"
-        compressed_filename = f"{base_name}.{extension}"
-        uploads.append(
-            {
-                "filename": compressed_filename,
-                "content": compressed_content,
-                "content_type": content_type,
-            }
-        )
+        source_sha256 = hashlib.sha256(content).hexdigest()
+        if source_sha256 in seen_hashes:
+            continue
+        seen_hashes.add(source_sha256)
+        existing_id = find_lion_image_by_hash(source_sha256)
+        if existing_id is not None:
+            # Same original bytes as an earlier upload: share the stored file.
+            uploads.append(
+                {
+                    "existing_id": existing_id,
+                    "source_sha256": source_sha256,
+                    "fresh_copy": partial(compressed_lion_upload, content, filename, source_sha256),
+                }
+            )
+            continue
+        uploads.append(compressed_lion_upload(content, filename, source_sha256))
 
     if form.images.errors:
         uploads.clear()
     return uploads
 
 
+def compressed_lion_upload(content: bytes, filename: str, source_sha256: str) -> dict:
+    compressed_content, content_type, extension = compress_lion_image(content)
+    base_name = os.path.splitext(filename)[0] or "lion-image"
+    return {
+        "filename": f"{base_name}.{extension}",
+        "content": compressed_content,
+        "content_type": content_type,
+        "source_sha256": source_sha256,
+    }
+
+
 def compress_lion_image(content: bytes) -> tuple[bytes, str, str]:
     """Compress uploaded images and return (content, content_type, extension)."""
-    with Image.open(io.BytesIO(content)) as img:
-        img = img.convert("RGB")
-        img.thumbnail((MAX_LION_IMAGE_DIM, MAX_LION_IMAGE_DIM))
-        buffer = io.BytesIO()
-        img.save(buffer, format="WEBP", quality=LION_IMAGE_QUALITY, optimize=True, method=6)
-    return buffer.getvalue(), "image/webp", "webp"
+    return compress_image(content, MAX_LION_IMAGE_DIM, LION_IMAGE_QUALITY, LION_IMAGE_EFFORT)
+
+
+def lion_qr_payload(lion_id: str) -> str:
+    lion_url = url_for("lion_detail", lion_id=lion_id, _external=True)
+    return f"{lion_url}#lion={lion_id}"
 
 
 def generate_lion_qr_png(lion_id: str) -> bytes:
+    return render_qr_png(lion_qr_payload(lion_id))
 
-    qr = qrcode.QRCode(
-        version=None,
-        error_correction=ERROR_CORRECT_Q,
-        box_size=10,
-        border=2,
-    )
-    lion_url = url_for("lion_detail", lion_id=lion_id, _external=True)
-    qr.add_data(f"{lion_url}#lion={lion_id}")
-    qr.make(fit=True)
-    image = qr.make_image(fill_color="#0F172A", back_color="white")
-    buffer = io.BytesIO()
-    image.save(buffer, format="PNG")
-    return buffer.getvalue()
+
+def generate_lion_qr_svg(lion_id: str) -> str:
+    return render_qr_svg(lion_qr_payload(lion_id))
 
 
 @app.route("/")
 def home():
     highlight_lions = []
-    for lion in get_lions():
+    for lion in leaderboard.top(HOME_SPOTLIGHT_SIZE):
         normalized = normalize_lion_time_fields(lion)
         attach_primary_image_url(normalized)
         highlight_lions.append(normalized)
-    lion_name_lookup = {}
-    for lion in get_lions():
-        lion_id = lion.get("_id")
-        lion_name = lion.get("name")
-        if lion_id and lion_name:
-            lion_name_lookup[str(lion_id)] = lion_name
-        if lion_name:
-            lion_name_lookup[lion_name] = lion_name
-        if lion.get("slug") and lion_name:
-            lion_name_lookup[lion.get("slug")] = lion_name
-    bids = get_bids()
-    total_raised = sum(bid.get("amount", 0) for bid in bids)
-    top_bid = max(bids, key=lambda bid: bid.get("amount", 0)) if bids else None
+    # Read the placed bid: a lion's current_bid may just be its starting price.
+    top_bid = get_top_bid()
     top_bid_lion_name = None
     if top_bid:
-        lion_ref = top_bid.get("lion_id") or top_bid.get("lion_name") or top_bid.get("lion")
-        top_bid_lion_name = lion_name_lookup.get(lion_ref) or top_bid.get("lion_name") or top_bid.get("lion")
+        spotlight_names = {str(lion["_id"]): lion.get("name") for lion in highlight_lions}
+        top_bid_lion_name = spotlight_names.get(top_bid.get("lion_id")) or top_bid.get("lion_name")
     return render_template(
         "index.html",
         highlight_lions=highlight_lions,
-        total_raised=total_raised,
+        total_raised=get_total_raised(),
         top_bid=top_bid,
         top_bid_lion_name=top_bid_lion_name,
         long_ducker_date="14 March 2026",
     )
 
 
-@app.route("/lions")
-def lions_catalog():
-    raw_lions = get_lions()
+def encode_lion_cursor(key: Optional[tuple]) -> Optional[str]:
+    if key is None:
+        return None
+    value, lion_oid = key
+    raw = json.dumps([value, str(lion_oid)], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_lion_cursor(token: Optional[str]) -> Optional[tuple]:
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        value, lion_id = json.loads(raw)
+        return value, ObjectId(lion_id)
+    except Exception:
+        abort(400)
+
+
+def catalog_cards(raw_lions: List[dict]) -> List[dict]:
     now = datetime.now(timezone.utc)
     lions = []
     for lion in raw_lions:
@@ -292,7 +472,53 @@ def lions_catalog():
         serialized["bidding_open"] = is_bidding_window_open(serialized, now)
         attach_primary_image_url(serialized)
         lions.append(serialized)
-    return render_template("lions.html", lions=lions)
+    return lions
+
+
+def catalog_filters() -> dict:
+    sort = request.args.get("sort", "name")
+    return {
+        "query": (request.args.get("q") or "").strip()[:100],
+        "house": (request.args.get("house") or "").strip() or None,
+        "sort": sort if sort in LION_PAGE_SORTS else "name",
+    }
+
+
+@app.route("/lions")
+def lions_catalog():
+    filters = catalog_filters()
+    context = {**filters, "houses": get_lion_houses(), "next_url": None, "next_fragment_url": None}
+
+    if filters["query"]:
+        # Text-score ranking has no stable key to seek on, so search results use numbered pages.
+        page = max(request.args.get("page", 1, type=int) or 1, 1)
+        raw_lions, total = search_lions(filters["query"], house=filters["house"], page=page, per_page=CATALOG_PAGE_SIZE)
+        context.update(page=page, total=total, total_pages=max((total + CATALOG_PAGE_SIZE - 1) // CATALOG_PAGE_SIZE, 1))
+    else:
+        after = decode_lion_cursor(request.args.get("after"))
+        raw_lions, next_key = get_lions_page(filters["sort"], after=after, limit=CATALOG_PAGE_SIZE, house=filters["house"])
+        next_cursor = encode_lion_cursor(next_key)
+        if next_cursor:
+            context["next_url"] = url_for("lions_catalog", house=filters["house"], sort=filters["sort"], after=next_cursor)
+            context["next_fragment_url"] = url_for("lions_catalog_page", house=filters["house"], sort=filters["sort"], after=next_cursor)
+
+    response = make_response(render_template("lions.html", lions=catalog_cards(raw_lions), **context))
+    return status_cache_headers(response, shared=False)
+
+
+@app.route("/lions/page")
+def lions_catalog_page():
+    """Next catalogue page as an HTML fragment for infinite scroll."""
+    filters = catalog_filters()
+    after = decode_lion_cursor(request.args.get("after"))
+    raw_lions, next_key = get_lions_page(filters["sort"], after=after, limit=CATALOG_PAGE_SIZE, house=filters["house"])
+    response = make_response(render_template("partials/_lion_cards.html", lions=catalog_cards(raw_lions)))
+    next_cursor = encode_lion_cursor(next_key)
+    if next_cursor:
+        response.headers["X-Next-Page"] = url_for("lions_catalog_page", house=filters["house"], sort=filters["sort"], after=next_cursor)
+        response.headers["X-Next-Page-Url"] = url_for("lions_catalog", house=filters["house"], sort=filters["sort"], after=next_cursor)
+    # Only the cards partial, with no session content, so shared caches may keep it.
+    return status_cache_headers(response)
 
 
 @app.route("/admin")
@@ -307,57 +533,40 @@ def admin_dashboard():
         serialized["bidding_open"] = is_bidding_window_open(serialized, now)
         attach_primary_image_url(serialized)
         admin_lions.append(serialized)
-        if serialized.get("id"):
-            lion_lookup[serialized["id"]] = serialized
-        if serialized.get("name"):
-            lion_lookup[serialized["name"]] = serialized
-        if serialized.get("slug"):
-            lion_lookup[serialized["slug"]] = serialized
+        lion_lookup[serialized["id"]] = serialized
 
-    bids = get_bids()
+    stats = get_bid_statistics()
+    lion_bid_summaries = []
+    # The table is truncated, so each lion's top bid comes from the full aggregation.
+    top_bid_ids = set()
+    for summary in stats["by_lion"]:
+        summary["lion"] = lion_lookup.get(summary.get("lion_id"))
+        summary["lion_name"] = summary.get("lion_name") or "Unknown lion"
+        if summary.get("highest_bid"):
+            top_bid_ids.add(str(summary["highest_bid"]["_id"]))
+        lion_bid_summaries.append(summary)
+
+    # The table shows recent bids only; the CSV export has the full history.
+    bids = get_bids(limit=ADMIN_DASHBOARD_BID_LIMIT)
     enriched_bids = []
-    bids_by_lion = {}
     for bid in bids:
         bid["id"] = str(bid["_id"])
-        lion_ref = bid.get("lion_id") or bid.get("lion")
-        lion_match = lion_lookup.get(lion_ref) if lion_ref else None
-        if not lion_match and bid.get("lion_name"):
-            lion_match = lion_lookup.get(bid.get("lion_name"))
+        lion_match = lion_lookup.get(bid.get("lion_id"))
         bid["lion_name"] = lion_match.get("name") if lion_match else (bid.get("lion_name") or bid.get("lion"))
-        bid["lion_id"] = bid.get("lion_id") or (lion_match.get("id") if lion_match else None)
         enriched_bids.append(bid)
 
-        group_key = bid.get("lion_id") or (lion_match.get("id") if lion_match else None) or (bid.get("lion_name") or bid.get("lion") or "unknown")
-        if group_key not in bids_by_lion:
-            bids_by_lion[group_key] = {
-                "lion": lion_match,
-                "lion_name": bid.get("lion_name") or "Unknown lion",
-                "lion_id": bid.get("lion_id") or (lion_match.get("id") if lion_match else None),
-                "bids": [],
-            }
-        bids_by_lion[group_key]["bids"].append(bid)
-
-    lion_bid_summaries = []
-    for summary in bids_by_lion.values():
-        summary_bids = summary.get("bids", [])
-        highest_bid = max(summary_bids, key=lambda b: b.get("amount", 0), default=None)
-        summary["highest_bid"] = highest_bid
-        summary["total_bids"] = len(summary_bids)
-        lion_bid_summaries.append(summary)
-
-    lion_bid_summaries.sort(key=lambda item: item.get("lion_name") or "")
-    unique_bidders = {bid.get("bidder") for bid in bids if bid.get("bidder")}
     metrics = {
         "total_lions": len(lions),
-        "total_bids": len(bids),
-        "unique_bidders": len(unique_bidders),
-        "highest_bid": max((bid.get("amount", 0) for bid in bids), default=0),
+        "total_bids": stats["total_bids"],
+        "unique_bidders": stats["unique_bidders"],
+        "highest_bid": stats["highest_bid"],
     }
     return render_template(
         "admin_dashboard.html",
         lions=admin_lions,
         bids=enriched_bids,
         bid_summaries=lion_bid_summaries,
+        top_bid_ids=top_bid_ids,
         metrics=metrics,
     )
 
@@ -407,11 +616,48 @@ def admin_create_lion():
         lion_id = insert_lion(lion_document)
         if uploads:
             add_lion_images(lion_id, uploads)
+        leaderboard.invalidate()
         flash("Lion added to the catalogue.", "success")
         return redirect(url_for("admin_lion_detail", lion_id=lion_id))
     return render_template("admin_lion_form.html", form=form, lion=None, mode="create")
 
 
+@app.route("/admin/lions/import", methods=["GET", "POST"])
+@admin_required
+def admin_import_lions():
+    """Bulk-create lions from a CSV/JSON sheet and a zip of images, streaming NDJSON progress."""
+    form = AdminLionImportForm()
+    if form.validate_on_submit():
+        archive = None
+        try:
+            rows = read_lion_rows(form.sheet.data.filename, form.sheet.data.read())
+        except ValueError as exc:
+            form.sheet.errors.append(str(exc))
+            rows = None
+        if form.images.data:
+            try:
+                archive = zipfile.ZipFile(io.BytesIO(form.images.data.read()))
+            except zipfile.BadZipFile:
+                form.images.errors.append("The image archive is not a valid zip file.")
+        if rows is not None and not form.images.errors:
+            events = import_lions(
+                rows, archive, HKT_TZ, (MAX_LION_IMAGE_DIM, LION_IMAGE_QUALITY, LION_IMAGE_EFFORT)
+            )
+
+            def stream():
+                for event in events:
+                    yield json.dumps(event) + "\n"
+                leaderboard.invalidate()
+                finalizer.wake()
+
+            return Response(
+                stream_with_context(stream()),
+                mimetype="application/x-ndjson",
+                headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+            )
+    return render_template("admin_lion_import.html", form=form)
+
+
 @app.route("/admin/lions/<lion_id>")
 @admin_required
 def admin_lion_detail(lion_id):
@@ -450,15 +696,12 @@ def admin_lion_qr_pdf(lion_id):
     if not lion:
         abort(404)
 
-    qr_png = generate_lion_qr_png(lion_id)
-    qr_base64 = base64.b64encode(qr_png).decode("ascii")
-
     html = render_template(
         "admin_lion_qr_pdf.html",
-        lions=[{"lion": lion, "qr_base64": qr_base64}],
+        lions=[{"lion": lion, "qr_svg": generate_lion_qr_svg(lion_id)}],
         generated_at=datetime.now(HKT_TZ),
     )
-    pdf_bytes = HTML(string=html, base_url=None).write_pdf()
+    pdf_bytes = render_pdf(html)
 
     response = make_response(pdf_bytes)
     response.headers["Content-Type"] = "application/pdf"
@@ -476,16 +719,14 @@ def admin_all_qr_pdf():
         lion = serialize_lion_record(normalize_lion_time_fields(lion))
         if not lion:
             continue
-        lion_id = lion["id"]
-        qr_png = generate_lion_qr_png(lion_id)
-        entries.append({"lion": lion, "qr_base64": base64.b64encode(qr_png).decode("ascii")})
+        entries.append({"lion": lion, "qr_svg": generate_lion_qr_svg(lion["id"])})
 
     html = render_template(
         "admin_lion_qr_pdf.html",
         lions=entries,
         generated_at=datetime.now(HKT_TZ),
     )
-    pdf_bytes = HTML(string=html, base_url=None).write_pdf()
+    pdf_bytes = render_pdf(html)
 
     response = make_response(pdf_bytes)
     response.headers["Content-Type"] = "application/pdf"
@@ -524,6 +765,12 @@ def admin_edit_lion(lion_id):
         updated = update_lion(lion_id, lion_document)
         if uploads:
             add_lion_images(lion_id, uploads)
+        if updated or uploads:
+            leaderboard.invalidate()
+        if source_lion.get("finalized_at") and (updated or uploads):
+            invalidate_lion_result(lion_id)
+        elif updated:
+            finalizer.wake()
         if updated or uploads:
             flash("Lion updated successfully.", "success")
         else:
@@ -572,6 +819,7 @@ def admin_delete_lion_image(lion_id, image_id):
 @admin_required
 def admin_delete_lion(lion_id):
     if delete_lion(lion_id):
+        leaderboard.invalidate()
         flash("Lion deleted.", "info")
     else:
         flash("Unable to delete the selected lion.", "warning")
@@ -582,6 +830,7 @@ def admin_delete_lion(lion_id):
 @admin_required
 def admin_clear_database():
     counts = clear_database()
+    leaderboard.invalidate()
     flash(
         f"Database cleared — {counts['lions']} lion(s), {counts['bids']} bid(s), and {counts['images']} image(s) deleted.",
         "warning",
@@ -631,7 +880,9 @@ def admin_delete_bid(bid_id):
     lion_id = bid.get("lion_id") if bid else None
     if delete_bid(bid_id):
         if lion_id:
-            update_lion_current_bid(lion_id, get_max_bid_for_lion(lion_id))
+            set_lion_current_bid(lion_id, get_max_bid_for_lion(lion_id))
+            invalidate_lion_result(lion_id)
+            leaderboard.invalidate()
         flash("Bid deleted.", "info")
     else:
         flash("Unable to delete the selected bid.", "warning")
@@ -653,14 +904,15 @@ def trail_reset():
 
 @app.route("/lions/<lion_id>", methods=["GET", "POST"])
 def lion_detail(lion_id):
-    lion = get_lion_by_id(lion_id)
-    if not lion:
+    source_lion = get_lion_by_id(lion_id)
+    if not source_lion:
         abort(404)
 
-    lion = normalize_lion_time_fields(lion)
+    now = datetime.now(timezone.utc)
+    result = get_or_finalize_result(source_lion, now)
+    lion = normalize_lion_time_fields(source_lion)
     lion = serialize_lion_record(lion)
     attach_primary_image_url(lion)
-    now = datetime.now(timezone.utc)
     bidding_open = is_bidding_window_open(lion, now)
     lion["bidding_open"] = bidding_open
 
@@ -678,6 +930,8 @@ def lion_detail(lion_id):
             form.amount.errors.append("Bidding is closed for this lion.")
         elif amount_value <= current:
             form.amount.errors.append("Bid must exceed the current amount.")
+        elif not database_available():
+            form.amount.errors.append(BIDDING_UNAVAILABLE_MESSAGE)
         else:
             bid_document = {
                 "lion": lion.get("name"),
@@ -688,33 +942,104 @@ def lion_detail(lion_id):
                 "contact": {"email": form.email.data, "phone": form.phone.data},
                 "timestamp": datetime.now(timezone.utc),
             }
-            insert_bid(bid_document)
-            update_lion_current_bid(lion_id, amount_value)
-            flash("Bid submitted successfully. We'll be in touch soon!", "success")
-            return redirect(url_for("lion_detail", lion_id=lion_id))
-
-    legacy_refs = {lion.get("name")}
-    if lion.get("slug"):
-        legacy_refs.add(lion.get("slug"))
-
-    related_bids = [
-        bid
-        for bid in get_bids()
-        if bid.get("lion_id") == lion_id
-        or bid.get("lion_name") in legacy_refs
-        or bid.get("lion") in legacy_refs
-    ]
-    return render_template(
-        "lion_detail.html",
-        lion=lion,
-        bids=related_bids,
-        form=form,
-        bidding_open=bidding_open,
-        current_time=now,
+            success_message = "Bid submitted successfully. We'll be in touch soon!"
+            unconfirmed = False
+            try:
+                if bid_ingestor:
+                    accepted = bid_ingestor.submit(bid_document)
+                else:
+                    insert_bid(bid_document)
+                    accepted = True
+            except DatabaseUnavailable:
+                accepted = None
+                form.amount.errors.append(BIDDING_UNAVAILABLE_MESSAGE)
+            except TimeoutError:
+                # The batch is still queued or being written, so the bid may yet be stored.
+                accepted = None
+                unconfirmed = True
+            if accepted and not bid_ingestor:
+                # The bid is stored; a failed price update must not make it look rejected.
+                try:
+                    update_lion_current_bid(lion_id, amount_value)
+                except DatabaseUnavailable:
+                    # Without the in-process finalizer, finalize-lions reconciles it instead.
+                    if AUCTION_FINALIZER_ENABLED:
+                        finalizer.repair_current_bid(lion_id)
+                    success_message = BID_RECEIVED_DELAYED_MESSAGE
+            if accepted or unconfirmed:
+                if accepted:
+                    leaderboard.record_bid(lion_id, amount_value)
+                    flash(success_message, "success")
+                else:
+                    flash(BID_UNCONFIRMED_MESSAGE, "warning")
+                response = redirect(url_for("lion_detail", lion_id=lion_id))
+                response.set_cookie(
+                    PRIMARY_READS_COOKIE, "1", max_age=MONGODB_MAX_STALENESS_SECONDS, httponly=True, samesite="Lax"
+                )
+                return response
+            if accepted is False:
+                if is_bidding_closed(lion):
+                    form.amount.errors.append("Bidding is closed for this lion.")
+                else:
+                    form.amount.errors.append("Bid must exceed the current amount.")
+
+    if result:
+        # Closed lions render from the frozen result, never from live bids.
+        related_bids = result.get("recent_bids") or []
+    else:
+        related_bids = get_bids_for_lion(lion_id, limit=LION_DETAIL_BID_LIMIT)
+    response = make_response(
+        render_template(
+            "lion_detail.html",
+            lion=lion,
+            bids=related_bids,
+            form=form,
+            bidding_open=bidding_open,
+            current_time=now,
+        )
     )
+    if result and request.method == "GET":
+        # The page embeds the session's CSRF token, flashes and admin links.
+        closed_lion_cache_headers(response, shared=False)
+    return response
 
-@app.route("/trail")
-def trail_view():
+
+@app.route("/api/lions/<lion_id>")
+def api_lion(lion_id):
+    source_lion = get_lion_by_id(lion_id)
+    if not source_lion:
+        abort(404)
+
+    now = datetime.now(timezone.utc)
+    result = get_or_finalize_result(source_lion, now)
+    lion = normalize_lion_time_fields(source_lion)
+    changes_at = lion_status_changes_at(lion, now)
+    payload = {
+        "id": lion_id,
+        "name": lion.get("name"),
+        "summary": lion.get("summary"),
+        "current_bid": int(lion.get("current_bid") or 0),
+        "bidding_starts_at": lion["bidding_starts_at"].isoformat() if lion.get("bidding_starts_at") else None,
+        "bidding_ends_at": lion["bidding_ends_at"].isoformat() if lion.get("bidding_ends_at") else None,
+        "bidding_open": is_bidding_window_open(lion, now),
+        "status": lion_status(lion.get("bidding_starts_at"), lion.get("bidding_ends_at"), now),
+        "status_changes_at": changes_at.isoformat() if changes_at else None,
+        "closed": bool(result),
+    }
+    if result:
+        payload["result"] = {
+            "final_bid": result.get("final_bid", 0),
+            "total_bids": result.get("total_bids", 0),
+            "unique_bidders": result.get("unique_bidders", 0),
+        }
+    response = jsonify(payload)
+    if result:
+        closed_lion_cache_headers(response)
+    else:
+        response.headers["Cache-Control"] = "no-cache"
+    return response
+
+def get_trail_lions() -> List[dict]:
     trail_lions = []
     for record in get_lions():
         serialized = serialize_lion_record(record)
@@ -724,13 +1049,266 @@ def trail_view():
         trail_lions.append(serialized)
 
     trail_lions.sort(key=lambda lion: lion.get("name") or "")
-    print(trail_lions)
+    return trail_lions
+
+
+@app.route("/api/lions/status-changes")
+def api_lion_status_changes():
+    """Lions that open or close within the next ``within`` minutes (default 60, at most a week)."""
+    within = max(1, min(request.args.get("within", 60, type=int) or 60, 7 * 24 * 60))
+    now = datetime.now(timezone.utc)
+    changes = []
+    for lion in get_lions_changing_status(now, now + timedelta(minutes=within)):
+        lion = normalize_lion_time_fields(lion)
+        changes_at = lion_status_changes_at(lion, now)
+        opening = changes_at == lion.get("bidding_starts_at")
+        changes.append(
+            {
+                "id": str(lion["_id"]),
+                "name": lion.get("name"),
+                "status": lion_status(lion.get("bidding_starts_at"), lion.get("bidding_ends_at"), now),
+                "change": "opens" if opening else "closes",
+                "at": changes_at.isoformat() if changes_at else None,
+            }
+        )
+    changes.sort(key=lambda change: change["at"] or "")
+    next_transition = ensure_utc_datetime(get_next_status_transition(now))
+    response = jsonify(
+        {
+            "within_minutes": within,
+            "changes": changes,
+            "next_transition_at": next_transition.isoformat() if next_transition else None,
+        }
+    )
+    return status_cache_headers(response, max_age=60)
+
+
+@app.route("/api/leaderboard")
+def api_leaderboard():
+    limit = max(1, min(request.args.get("limit", leaderboard.size, type=int) or leaderboard.size, leaderboard.size))
+    payload = [
+        {"rank": rank, "id": str(lion["_id"]), "name": lion.get("name"), "current_bid": int(lion.get("current_bid") or 0)}
+        for rank, lion in enumerate(leaderboard.top(limit), start=1)
+    ]
+    response = jsonify(payload)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@app.route("/trail")
+def trail_view():
+    trail_lions = get_trail_lions()
     return render_template(
         "trail.html",
         lions=trail_lions,
         total_stops=len(trail_lions),
     )
 
+
+@app.route("/trail/manifest.json")
+def trail_manifest():
+    """List every URL the trail page needs, each with a content hash, for the service worker."""
+    trail_lions = get_trail_lions()
+    assets = []
+    for filename in TRAIL_STATIC_ASSETS:
+        content_hash = static_file_hash(filename)
+        if content_hash:
+            assets.append({"url": url_for("static", filename=filename), "hash": content_hash})
+    for lion in trail_lions:
+        image_url = lion.get("image_url")
+        # Uploaded images are addressed by GridFS id, so the URL is already content-stable.
+        if image_url and image_url.startswith("/"):
+            assets.append({"url": image_url, "hash": image_url.rsplit("/", 1)[-1]})
+
+    page_source = json.dumps(
+        [[lion["id"], lion.get("name"), lion.get("image_url")] for lion in trail_lions]
+        + [asset["hash"] for asset in assets]
+        + [file_hash(os.path.join(app.root_path, "templates", "trail.html"))]
+    )
+    page_revision = hashlib.sha256(page_source.encode("utf-8")).hexdigest()[:12]
+    response = jsonify(
+        {
+            "version": page_revision,
+            "page": {"url": url_for("trail_view"), "revision": page_revision},
+            "assets": assets,
+        }
+    )
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@app.route("/trail-sw.js")
+def trail_service_worker():
+    # Served from the site root so the worker may control the /trail page.
+    response = send_from_directory(app.static_folder, "js/trail-sw.js", mimetype="text/javascript")
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@app.route("/static/dist/<path:filename>")
+def static_dist(filename):
+    """Serve fingerprinted assets, preferring a prebuilt brotli or gzip variant."""
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+        if request.accept_encodings[encoding] and os.path.isfile(safe_join(DIST_DIR, filename + suffix) or ""):
+            response = send_from_directory(DIST_DIR, filename + suffix, mimetype=mimetype)
+            response.headers["Content-Encoding"] = encoding
+            break
+    else:
+        response = send_from_directory(DIST_DIR, filename, mimetype=mimetype)
+    response.vary.add("Accept-Encoding")
+    response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+
+def allows_secondary_reads() -> bool:
+    """Public GETs may read from secondaries; writes, admin views and recent bidders may not."""
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if request.path.startswith("/admin") or PRIMARY_READS_COOKIE in request.cookies:
+        return False
+    return True
+
+
+@app.before_request
+def start_auction_finalizer():
+    if AUCTION_FINALIZER_ENABLED:
+        finalizer.start()
+
+
+@app.before_request
+def route_public_reads():
+    g.read_routing_token = route_reads_to_secondaries(allows_secondary_reads())
+
+
+@app.teardown_request
+def reset_public_read_routing(exc):
+    token = g.pop("read_routing_token", None)
+    if token is not None:
+        reset_read_routing(token)
+
+
+@app.before_request
+def reset_stale_data_flag():
+    clear_stale_flag()
+
+
+@app.after_request
+def never_cache_stale_data(response):
+    if served_stale_data():
+        response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+def database_unavailable(exc):
+    response = make_response("The auction is temporarily unavailable. Please try again in a minute.", 503)
+    response.headers["Retry-After"] = "30"
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+# Unguarded admin reads and writes surface raw driver errors during an outage.
+for database_failure in (DatabaseUnavailable, *DATABASE_FAILURES):
+    app.register_error_handler(database_failure, database_unavailable)
+
+
+@app.before_request
+def start_request_profile():
+    # Checking the query string first keeps the session untouched for normal requests.
+    on_demand = "profile" in request.args and admin_is_authenticated()
+    if on_demand or profiler.should_sample(request.endpoint):
+        g.profile = profiler.start()
+
+
+def finish_request_profile() -> Optional[str]:
+    profile = g.pop("profile", None)
+    if profile is None:
+        return None
+    return profiler.finish(profile, request.endpoint or "unmatched")
+
+
+@app.after_request
+def write_request_profile(response):
+    path = finish_request_profile()
+    if path and admin_is_authenticated():
+        response.headers["X-Profile"] = os.path.basename(path)
+    return response
+
+
+@app.teardown_request
+def stop_request_profile(exc):
+    # after_request is skipped when a view raises; make sure profiling still stops.
+    finish_request_profile()
+
+
+@app.url_defaults
+def add_static_version(endpoint, values):
+    if endpoint != "static" or "filename" not in values:
+        return
+    fingerprinted = fingerprinted_filename(values["filename"])
+    if fingerprinted:
+        values["filename"] = fingerprinted
+        return
+    version = static_file_hash(values["filename"])
+    if version:
+        values.setdefault("v", version)
+
+
+@app.cli.command("build-assets")
+def build_assets_command():
+    """Write content-hashed, precompressed copies of static/ to static/dist/."""
+    missing = [filename for filename in TRAIL_STATIC_ASSETS if not static_file_hash(filename)]
+    if missing:
+        # e.g. js/vendor/jsQR.js, which `npm install` copies out of node_modules.
+        raise click.ClickException(f"Missing static file(s): {', '.join(missing)}. Run `npm install` first.")
+    manifest = build_static_assets()
+    print(f"Built {len(manifest)} asset(s) into {DIST_DIR}")
+
+
+@app.cli.command("compile-templates")
+def compile_templates_command():
+    """Compile every template into the shared Jinja bytecode cache."""
+    if not JINJA_BYTECODE_CACHE_DIR:
+        print("JINJA_BYTECODE_CACHE_DIR is empty; nothing to compile into.")
+        return
+    # Fail here, at build time, if the directory cannot be created.
+    os.makedirs(JINJA_BYTECODE_CACHE_DIR, exist_ok=True)
+    names = app.jinja_env.list_templates(extensions=["html"])
+    for name in names:
+        app.jinja_env.get_template(name)
+    print(f"Compiled {len(names)} template(s) into {JINJA_BYTECODE_CACHE_DIR}")
+
+
+@app.cli.command("ensure-indexes")
+def ensure_indexes_command():
+    """Create the MongoDB indexes the read paths rely on."""
+    ensure_indexes()
+    print("Indexes are up to date.")
+
+
+@app.cli.command("migrate-bid-refs")
+@click.option("--batch-size", default=1000, show_default=True, help="Bids resolved per bulk write.")
+@click.option("--restart", is_flag=True, help="Ignore the saved checkpoint and start from the first bid.")
+def migrate_bid_refs_command(batch_size, restart):
+    """Backfill lion_id on legacy bids; safe to interrupt and re-run."""
+
+    def report(state):
+        print(f"  processed {state['processed']:,} bid(s): {state['resolved']:,} resolved, {state['unresolved']:,} unresolved")
+
+    state = backfill_bid_lion_ids(batch_size=batch_size, restart=restart, progress=report)
+    print(f"Done. {state['resolved']:,} bid(s) resolved, {state['unresolved']:,} recorded in unresolved_bid_refs.")
+
+
+@app.cli.command("finalize-lions")
+def finalize_lions_command():
+    """Repair stale current bids, then finalize every lion whose bidding window has closed."""
+    repaired = reconcile_current_bids()
+    if repaired:
+        print(f"Raised current_bid on {repaired} lion(s) to their highest stored bid")
+    for result in finalize_due_lions():
+        print(f"Finalized {result['lion_name']}: ${result['final_bid']:,} from {result['total_bids']} bid(s)")
+
+
 @app.context_processor
 def inject_global_context():
     now = datetime.now(timezone.utc)
@@ -738,6 +1316,7 @@ def inject_global_context():
         "current_year": now.year,
         "current_time": now,
         "admin_logged_in": admin_is_authenticated(),
+        "data_delayed": served_stale_data(),
         "csrf_token": generate_csrf,
     }
 
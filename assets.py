@@ -0,0 +1,93 @@
+"""Content hashes and fingerprinted, precompressed builds of static files."""
+
+import hashlib
+import json
+import os
+from typing import Optional
+
+STATIC_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+_hash_cache: dict[str, tuple[float, str]] = {}
+
+
+def file_hash(path: str, length: int = 12) -> Optional[str]:
+    """Return a short SHA-256 of ``path``, recomputed only when its mtime changes."""
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    cached = _hash_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1][:length]
+    with open(path, "rb") as handle:
+        digest = hashlib.sha256(handle.read()).hexdigest()
+    _hash_cache[path] = (mtime, digest)
+    return digest[:length]
+
+
+def static_file_hash(filename: str, length: int = 12) -> Optional[str]:
+    return file_hash(os.path.join(STATIC_ROOT, filename), length)
+
+
+DIST_DIR = os.path.join(STATIC_ROOT, "dist")
+DIST_MANIFEST = os.path.join(DIST_DIR, "manifest.json")
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".svg", ".json", ".ico", ".txt", ".map"}
+# The service worker must keep a stable URL; input.css is Tailwind source, not served.
+UNVERSIONED_FILES = {"js/trail-sw.js", "css/input.css"}
+
+_manifest_cache: tuple[float, dict[str, str]] = (0.0, {})
+
+
+def build_static_assets(min_compress_bytes: int = 512) -> dict[str, str]:
+    """Copy ``static/`` into ``static/dist/`` under content-hashed names.
+
+    Text assets also get ``.gz`` and ``.br`` siblings so requests never pay
+    for compression. Returns the manifest of original -> hashed filenames.
+    """
+    import gzip
+    import shutil
+
+    import brotli
+
+    if os.path.isdir(DIST_DIR):
+        shutil.rmtree(DIST_DIR)
+
+    manifest: dict[str, str] = {}
+    for directory, dirnames, filenames in os.walk(STATIC_ROOT):
+        dirnames[:] = [name for name in dirnames if os.path.join(directory, name) != DIST_DIR]
+        for name in filenames:
+            source = os.path.join(directory, name)
+            relative = os.path.relpath(source, STATIC_ROOT).replace(os.sep, "/")
+            if relative in UNVERSIONED_FILES:
+                continue
+            stem, extension = os.path.splitext(relative)
+            hashed = f"{stem}.{static_file_hash(relative)}{extension}"
+            target = os.path.join(DIST_DIR, hashed)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(source, "rb") as handle:
+                content = handle.read()
+            with open(target, "wb") as handle:
+                handle.write(content)
+            if extension.lower() in COMPRESSIBLE_EXTENSIONS and len(content) >= min_compress_bytes:
+                with open(f"{target}.gz", "wb") as handle:
+                    handle.write(gzip.compress(content, compresslevel=9, mtime=0))
+                with open(f"{target}.br", "wb") as handle:
+                    handle.write(brotli.compress(content, quality=11))
+            manifest[relative] = f"dist/{hashed}"
+
+    with open(DIST_MANIFEST, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    return manifest
+
+
+def fingerprinted_filename(filename: str) -> Optional[str]:
+    """Return the built ``dist/`` path for ``filename``, or None if assets are not built."""
+    global _manifest_cache
+    try:
+        mtime = os.stat(DIST_MANIFEST).st_mtime
+    except OSError:
+        return None
+    if _manifest_cache[0] != mtime:
+        with open(DIST_MANIFEST, encoding="utf-8") as handle:
+            _manifest_cache = (mtime, json.load(handle))
+    return _manifest_cache[1].get(filename)
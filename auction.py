@@ -0,0 +1,99 @@
+"""Background finalization of lions as their bidding windows close."""
+
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from db import (
+    finalize_lion,
+    get_lions_due_for_finalization,
+    get_max_bid_for_lion,
+    get_next_status_transition,
+    update_lion_current_bid,
+)
+
+logger = logging.getLogger(__name__)
+
+FINALIZER_INTERVAL_SECONDS = int(os.environ.get("AUCTION_FINALIZER_INTERVAL", "60"))
+
+
+def finalize_due_lions(now: Optional[datetime] = None) -> List[dict]:
+    now = now or datetime.now(timezone.utc)
+    return [finalize_lion(lion) for lion in get_lions_due_for_finalization(now)]
+
+
+class AuctionFinalizer:
+    """Daemon thread that sleeps until the next ``bidding_starts_at`` or
+    ``bidding_ends_at`` and finalizes lions whose window has closed.
+
+    The wait is capped at ``interval`` seconds so edits made by other workers
+    are picked up; call :meth:`wake` after changing a bidding window locally.
+    Lions queued with :meth:`repair_current_bid` get ``current_bid`` reset to
+    their highest stored bid on the next pass.
+    """
+
+    def __init__(self, interval: int = FINALIZER_INTERVAL_SECONDS):
+        self.interval = interval
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._repairs: set[str] = set()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="auction-finalizer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def repair_current_bid(self, lion_id: str) -> None:
+        """Queue a lion whose bid was stored but whose ``current_bid`` update failed."""
+        with self._lock:
+            self._repairs.add(lion_id)
+        self._wake.set()
+
+    def _repair_current_bids(self) -> None:
+        with self._lock:
+            lion_ids, self._repairs = list(self._repairs), set()
+        for index, lion_id in enumerate(lion_ids):
+            try:
+                update_lion_current_bid(lion_id, get_max_bid_for_lion(lion_id))
+            except Exception:
+                with self._lock:
+                    self._repairs.update(lion_ids[index:])
+                raise
+
+    def _next_wait(self, now: datetime) -> float:
+        next_transition = get_next_status_transition(now)
+        if next_transition is None:
+            return self.interval
+        if next_transition.tzinfo is None:
+            next_transition = next_transition.replace(tzinfo=timezone.utc)
+        return min(self.interval, max((next_transition - now).total_seconds(), 0.0) + 0.5)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            wait = self.interval
+            try:
+                self._repair_current_bids()
+                finalized = finalize_due_lions()
+                if finalized:
+                    logger.info("Finalized %d lion(s)", len(finalized))
+                wait = self._next_wait(datetime.now(timezone.utc))
+            except Exception:
+                logger.exception("Auction finalization failed")
+            self._wake.wait(wait)
+            self._wake.clear()
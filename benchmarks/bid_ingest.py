@@ -0,0 +1,97 @@
+"""Compare direct and group-commit bid ingestion throughput against MongoDB.
+
+Simulates closing-minute traffic: ``--threads`` request threads each place
+``--bids`` ever-increasing bids across ``--lions`` lions. Uses a scratch
+database (``MONGODB_DB`` defaults to ``lion-auction-bench``) that is dropped
+afterwards; any other name must also end in ``-bench``.
+
+    MONGODB_URI=mongodb://localhost:27017 python benchmarks/bid_ingest.py --threads 32
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGODB_DB", "lion-auction-bench")
+
+import db  # noqa: E402
+from bid_ingest import BidIngestor  # noqa: E402
+
+
+def seed_lions(count: int) -> list[str]:
+    db.lions_collection.delete_many({})
+    db.bids_collection.delete_many({})
+    result = db.lions_collection.insert_many(
+        [{"name": f"Bench Lion {index}", "current_bid": 0, "image_ids": []} for index in range(count)]
+    )
+    return [str(inserted_id) for inserted_id in result.inserted_ids]
+
+
+def direct_submit(bid: dict) -> bool:
+    # Mirrors the inline path in lion_detail: read current, insert, update.
+    lion = db.get_lion_by_id(bid["lion_id"])
+    if bid["amount"] <= int(lion.get("current_bid") or 0):
+        return False
+    db.insert_bid(bid)
+    db.update_lion_current_bid(bid["lion_id"], bid["amount"])
+    return True
+
+
+def run(submit, lion_ids: list[str], threads: int, bids_per_thread: int) -> tuple[float, int]:
+    amounts = itertools.count(1)
+    amount_lock = threading.Lock()
+    accepted = [0] * threads
+
+    def worker(index: int) -> None:
+        for bid_index in range(bids_per_thread):
+            with amount_lock:
+                amount = next(amounts)
+            bid = {
+                "lion_id": lion_ids[(index + bid_index) % len(lion_ids)],
+                "amount": amount,
+                "bidder": f"Bidder {index}",
+                "contact": {"email": f"bidder{index}@example.com", "phone": ""},
+                "timestamp": datetime.now(timezone.utc),
+            }
+            if submit(bid):
+                accepted[index] += 1
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - started, sum(accepted)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--bids", type=int, default=200, help="bids per thread")
+    parser.add_argument("--lions", type=int, default=6)
+    parser.add_argument("--window-ms", type=float, default=5)
+    args = parser.parse_args()
+    if not db.MONGODB_DB.endswith("-bench"):
+        # The run wipes and then drops the database, so never point it at real data.
+        parser.error(f"MONGODB_DB={db.MONGODB_DB!r} must end in '-bench'; this benchmark deletes everything in it")
+
+    total = args.threads * args.bids
+    ingestor = BidIngestor(window_ms=args.window_ms)
+    try:
+        for label, submit in (("direct", direct_submit), (f"batched ({args.window_ms:g} ms)", ingestor.submit)):
+            lion_ids = seed_lions(args.lions)
+            elapsed, accepted = run(submit, lion_ids, args.threads, args.bids)
+            print(f"{label:>18}: {total / elapsed:8.0f} bids/s  ({accepted}/{total} accepted, {elapsed:.2f} s)")
+    finally:
+        db.client.drop_database(db.MONGODB_DB)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
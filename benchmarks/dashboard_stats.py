@@ -0,0 +1,103 @@
+"""Time the admin dashboard statistics as the bid count grows.
+
+Compares the aggregation pipeline in ``db.get_bid_statistics`` with the
+previous approach of loading every bid into Flask and grouping in Python.
+Uses a scratch database (``MONGODB_DB`` defaults to ``lion-auction-bench``)
+that is dropped afterwards; any other name must also end in ``-bench``.
+
+    python benchmarks/dashboard_stats.py --sizes 1000 10000 100000 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGODB_DB", "lion-auction-bench")
+
+import db  # noqa: E402
+
+
+def seed(lion_count: int, bid_count: int) -> None:
+    db.lions_collection.delete_many({})
+    db.bids_collection.delete_many({})
+    lions = [{"name": f"Bench Lion {index}", "current_bid": 0} for index in range(lion_count)]
+    lion_ids = [str(oid) for oid in db.lions_collection.insert_many(lions).inserted_ids]
+    start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    batch = []
+    for index in range(bid_count):
+        lion_index = random.randrange(lion_count)
+        bid = {"amount": random.randint(100, 50000), "bidder": f"Bidder {random.randrange(bid_count // 3 + 1)}"}
+        bid["timestamp"] = start + timedelta(seconds=index)
+        # Keep a share of legacy name-only references, as in real data.
+        if index % 10 == 0:
+            bid["lion"] = bid["lion_name"] = lions[lion_index]["name"]
+        else:
+            bid["lion_id"] = lion_ids[lion_index]
+            bid["lion_name"] = lions[lion_index]["name"]
+        batch.append(bid)
+        if len(batch) == 10000:
+            db.bids_collection.insert_many(batch)
+            batch = []
+    if batch:
+        db.bids_collection.insert_many(batch)
+
+
+def python_statistics() -> dict:
+    # The pre-aggregation dashboard: every lion and bid is decoded in Flask.
+    lion_lookup = {}
+    for lion in db.get_lions():
+        lion_lookup[str(lion["_id"])] = lion
+        lion_lookup[lion["name"]] = lion
+    bids = db.get_bids()
+    by_lion: dict = {}
+    for bid in bids:
+        lion = lion_lookup.get(bid.get("lion_id") or bid.get("lion")) or lion_lookup.get(bid.get("lion_name"))
+        key = str(lion["_id"]) if lion else bid.get("lion_name")
+        by_lion.setdefault(key, []).append(bid)
+    for rows in by_lion.values():
+        max(rows, key=lambda b: b.get("amount", 0))
+    return {
+        "total_bids": len(bids),
+        "unique_bidders": len({bid.get("bidder") for bid in bids if bid.get("bidder")}),
+        "highest_bid": max((bid.get("amount", 0) for bid in bids), default=0),
+        "lions": len(by_lion),
+    }
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--lions", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    if not db.MONGODB_DB.endswith("-bench"):
+        # The run wipes and then drops the database, so never point it at real data.
+        parser.error(f"MONGODB_DB={db.MONGODB_DB!r} must end in '-bench'; this benchmark deletes everything in it")
+
+    print(f"{'bids':>10}  {'python (ms)':>12}  {'aggregate (ms)':>15}")
+    try:
+        for size in args.sizes:
+            seed(args.lions, size)
+            python_ms = best_of(python_statistics, args.repeat)
+            aggregate_ms = best_of(db.get_bid_statistics, args.repeat)
+            print(f"{size:>10}  {python_ms:>12.1f}  {aggregate_ms:>15.1f}")
+    finally:
+        db.client.drop_database(db.MONGODB_DB)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
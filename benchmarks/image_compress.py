@@ -0,0 +1,85 @@
+"""Time server-side lion image compression over a directory of photos.
+
+Compares the previous path (full-resolution decode, WebP ``method=6``) with
+``media.compress_image`` at each ``--efforts`` level, and measures the
+passthrough for WebPs that the admin form has already compressed in the
+browser. Point ``--photos`` at a folder of real phone photos (JPEG, PNG,
+WebP); sizes are reported as totals over the corpus.
+
+    python benchmarks/image_compress.py --photos ~/Pictures/lion-shoot --efforts 4 6
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image  # noqa: E402
+
+from media import compress_image  # noqa: E402
+
+PHOTO_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
+
+
+def previous_compress(content: bytes, max_dim: int, quality: int) -> bytes:
+    with Image.open(io.BytesIO(content)) as img:
+        img = img.convert("RGB")
+        img.thumbnail((max_dim, max_dim))
+        buffer = io.BytesIO()
+        img.save(buffer, format="WEBP", quality=quality, optimize=True, method=6)
+    return buffer.getvalue()
+
+
+def load_corpus(directory: str) -> list[bytes]:
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        if os.path.splitext(name)[1].lower() in PHOTO_EXTENSIONS:
+            with open(os.path.join(directory, name), "rb") as handle:
+                corpus.append(handle.read())
+    return corpus
+
+
+def run(func, corpus: list[bytes]) -> tuple[float, int]:
+    started = time.perf_counter()
+    total_bytes = sum(len(func(content)) for content in corpus)
+    return (time.perf_counter() - started) * 1000, total_bytes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--photos", required=True, help="Directory of sample photos")
+    parser.add_argument("--max-dim", type=int, default=int(os.environ.get("MAX_LION_IMAGE_DIM", "1600")))
+    parser.add_argument("--quality", type=int, default=int(os.environ.get("LION_IMAGE_QUALITY", "80")))
+    parser.add_argument("--efforts", type=int, nargs="+", default=[0, 2, 4, 6])
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.photos)
+    if not corpus:
+        print(f"No photos found in {args.photos}", file=sys.stderr)
+        return 1
+    source_bytes = sum(len(content) for content in corpus)
+    print(f"{len(corpus)} photos, {source_bytes / 1e6:.1f} MB\n")
+    print(f"{'path':<28}  {'total (ms)':>11}  {'per photo (ms)':>15}  {'output (MB)':>12}")
+
+    def report(label: str, elapsed_ms: float, total_bytes: int) -> None:
+        print(f"{label:<28}  {elapsed_ms:>11.0f}  {elapsed_ms / len(corpus):>15.1f}  {total_bytes / 1e6:>12.2f}")
+
+    report("previous (method=6)", *run(lambda c: previous_compress(c, args.max_dim, args.quality), corpus))
+    for effort in args.efforts:
+        report(
+            f"compress_image effort={effort}",
+            *run(lambda c: compress_image(c, args.max_dim, args.quality, effort)[0], corpus),
+        )
+
+    # What the browser-side compression hands the server: WebP already within max_dim.
+    browser_webps = [previous_compress(content, args.max_dim, args.quality) for content in corpus]
+    report("pre-compressed, previous", *run(lambda c: previous_compress(c, args.max_dim, args.quality), browser_webps))
+    report("pre-compressed, passthrough", *run(lambda c: compress_image(c, args.max_dim, args.quality)[0], browser_webps))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Compare the all-lions QR sheet built with raster PNG and vector SVG codes.
+
+Renders ``admin_lion_qr_pdf.html`` for ``--lions`` synthetic lions twice:
+once with base64-inlined PNGs (the previous approach) and once with inline
+SVG paths, then reports QR generation time, WeasyPrint time and PDF size.
+No database is needed.
+
+    python benchmarks/qr_pdf.py --lions 25 100
+"""
+
+import argparse
+import base64
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId  # noqa: E402
+from flask import render_template  # noqa: E402
+
+from app import HKT_TZ, app, generate_lion_qr_png, generate_lion_qr_svg  # noqa: E402
+from media import render_pdf  # noqa: E402
+
+
+def raster_entry(lion: dict) -> dict:
+    return {"lion": lion, "qr_base64": base64.b64encode(generate_lion_qr_png(lion["id"])).decode("ascii")}
+
+
+def vector_entry(lion: dict) -> dict:
+    return {"lion": lion, "qr_svg": generate_lion_qr_svg(lion["id"])}
+
+
+def build_sheet(lions: list[dict], make_entry) -> tuple[float, float, int]:
+    started = time.perf_counter()
+    entries = [make_entry(lion) for lion in lions]
+    html = render_template("admin_lion_qr_pdf.html", lions=entries, generated_at=datetime.now(HKT_TZ))
+    generated = time.perf_counter()
+    pdf = render_pdf(html)
+    finished = time.perf_counter()
+    return (generated - started) * 1000, (finished - generated) * 1000, len(pdf)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lions", type=int, nargs="+", default=[25, 100])
+    args = parser.parse_args()
+
+    print(f"{'lions':>6}  {'mode':<7}  {'qr + html (ms)':>15}  {'pdf (ms)':>10}  {'size (KB)':>10}")
+    with app.test_request_context("/"):
+        render_pdf("<p>warm up</p>")
+        for count in args.lions:
+            lions = [{"id": str(ObjectId()), "name": f"Lion {index:03d}"} for index in range(count)]
+            for mode, make_entry in (("raster", raster_entry), ("vector", vector_entry)):
+                qr_ms, pdf_ms, size = build_sheet(lions, make_entry)
+                print(f"{count:>6}  {mode:<7}  {qr_ms:>15.0f}  {pdf_ms:>10.0f}  {size / 1024:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Measure worker startup cost (import time and peak RSS) for ``app``.
+
+Runs ``python -X importtime -c "import app"`` in a fresh interpreter, reports
+the slowest top-level imports and fails when the budget is exceeded, so a
+heavy dependency sneaking back into module import time is caught early.
+
+    python benchmarks/startup.py --max-import-ms 600 --max-rss-mb 80
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("weasyprint", "qrcode", "PIL")
+
+
+def run_once(module: str) -> tuple[float, float, list[tuple[int, str]], set[str]]:
+    """Return (import ms, peak RSS MB, direct imports of ``module``, all loaded modules)."""
+    code = f"import {module}, resource, sys; sys.stdout.write(str(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rss_kb = float(proc.stdout.strip() or 0)
+    if sys.platform == "darwin":
+        rss_kb /= 1024
+    loaded, pending, direct = set(), [], []
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue
+        # -X importtime prints children before their parent, indented two
+        # spaces per level.
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        name = name.strip()
+        loaded.add(name.split(".")[0])
+        if depth == 1:
+            pending.append((int(cumulative), name))
+        elif depth == 0:
+            if name == module:
+                total_us, direct = int(cumulative), pending
+            pending = []
+    return total_us / 1000, rss_kb / 1024, sorted(direct, reverse=True), loaded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    parser.add_argument("--max-rss-mb", type=float, default=None)
+    args = parser.parse_args()
+
+    import_ms, rss_mb = [], []
+    for _ in range(args.runs):
+        ms, mb, direct, loaded = run_once(args.module)
+        import_ms.append(ms)
+        rss_mb.append(mb)
+
+    median_ms = statistics.median(import_ms)
+    median_mb = statistics.median(rss_mb)
+    print(f"import {args.module}: median {median_ms:.1f} ms over {args.runs} runs, peak RSS {median_mb:.1f} MB")
+    print("slowest imports (cumulative ms):")
+    for us, name in direct[:10]:
+        print(f"  {us / 1000:8.1f}  {name}")
+
+    failures = []
+    eager = sorted(loaded.intersection(HEAVY_MODULES))
+    if eager:
+        failures.append(f"heavy modules imported at startup: {', '.join(eager)}")
+    if args.max_import_ms is not None and median_ms > args.max_import_ms:
+        failures.append(f"import time {median_ms:.1f} ms exceeds budget of {args.max_import_ms:.1f} ms")
+    if args.max_rss_mb is not None and median_mb > args.max_rss_mb:
+        failures.append(f"peak RSS {median_mb:.1f} MB exceeds budget of {args.max_rss_mb:.1f} MB")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Render each page template with synthetic data at several catalogue sizes.
+
+No database is needed: lions and bids are generated in memory and pushed
+through the same helpers the views use, then only ``render_template`` is
+timed. The ``compile`` rows compare loading every template from source with
+loading it from a warm Jinja bytecode cache.
+
+    python benchmarks/template_render.py --lions 10 100 1000 --bids 100 1000 10000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId  # noqa: E402
+from flask import render_template  # noqa: E402
+from jinja2 import Environment, FileSystemBytecodeCache  # noqa: E402
+
+import app as lion_app  # noqa: E402
+from app import HKT_TZ, app, catalog_cards  # noqa: E402
+
+HOUSES = ["Byron", "Churchill", "Druries", "Elmfield", "Moretons", "Newlands", "Rendalls", "West Acre"]
+
+
+def synthetic_lions(count: int) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "_id": ObjectId(),
+            "name": f"Lion {index:04d}",
+            "house": random.choice(HOUSES),
+            "summary": "A hand-painted fibreglass lion from the trail. " * 3,
+            "current_bid": random.randint(0, 50000),
+            "bidding_starts_at": now - timedelta(days=3),
+            "bidding_ends_at": now + timedelta(days=random.randint(-2, 5)),
+            "image_ids": [ObjectId()],
+        }
+        for index in range(count)
+    ]
+
+
+def synthetic_bids(lions: list[dict], count: int) -> list[dict]:
+    start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    bids = []
+    for index in range(count):
+        lion = random.choice(lions)
+        bids.append(
+            {
+                "_id": ObjectId(),
+                "id": str(ObjectId()),
+                "lion_id": str(lion["_id"]),
+                "lion_name": lion["name"],
+                "amount": random.randint(100, 50000),
+                "bidder": f"Bidder {index}",
+                "contact": {"email": f"bidder{index}@example.com", "phone": "+852 5555 0000"},
+                "timestamp": start + timedelta(seconds=index),
+            }
+        )
+    return bids
+
+
+def bid_summaries(cards: list[dict], bids: list[dict]) -> list[dict]:
+    by_id = {card["id"]: card for card in cards}
+    summaries: dict[str, dict] = {}
+    for bid in bids:
+        summary = summaries.setdefault(
+            bid["lion_id"],
+            {"lion_id": bid["lion_id"], "lion_name": bid["lion_name"], "total_bids": 0, "highest_bid": None},
+        )
+        summary["total_bids"] += 1
+        if not summary["highest_bid"] or bid["amount"] > summary["highest_bid"]["amount"]:
+            summary["highest_bid"] = bid
+    for summary in summaries.values():
+        summary["lion"] = by_id.get(summary["lion_id"])
+    return sorted(summaries.values(), key=lambda summary: summary["lion_name"])
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def compile_all(bytecode_cache=None) -> None:
+    environment = Environment(loader=app.jinja_loader, bytecode_cache=bytecode_cache)
+    for name in environment.list_templates(extensions=["html"]):
+        environment.get_template(name)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lions", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--bids", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        bytecode_cache = FileSystemBytecodeCache(cache_dir)
+        compile_all(bytecode_cache)
+        print(f"{'compile, from source':<40}  {best_of(compile_all, args.repeat):>10.1f} ms")
+        print(f"{'compile, from bytecode cache':<40}  {best_of(lambda: compile_all(bytecode_cache), args.repeat):>10.1f} ms\n")
+
+    print(f"{'template':<24}  {'lions':>6}  {'bids':>7}  {'render (ms)':>12}")
+
+    def report(template: str, lions: int, bids: int, context: dict) -> None:
+        render_template(template, **context)  # warm the template cache
+        elapsed = best_of(lambda: render_template(template, **context), args.repeat)
+        print(f"{template:<24}  {lions:>6}  {bids:>7}  {elapsed:>12.2f}")
+
+    with app.test_request_context("/"):
+        for lion_count in args.lions:
+            lions = synthetic_lions(lion_count)
+            cards = catalog_cards([dict(lion) for lion in lions])
+            top = sorted(cards, key=lambda card: card["current_bid"], reverse=True)[: lion_app.HOME_SPOTLIGHT_SIZE]
+            report(
+                "index.html",
+                lion_count,
+                0,
+                {
+                    "highlight_lions": top,
+                    "total_raised": sum(card["current_bid"] for card in cards),
+                    "top_bid": {"amount": top[0]["current_bid"], "lion": top[0]["name"]},
+                    "top_bid_lion_name": top[0]["name"],
+                    "long_ducker_date": "14 March 2026",
+                },
+            )
+            report(
+                "lions.html",
+                lion_count,
+                0,
+                {
+                    "lions": cards[: lion_app.CATALOG_PAGE_SIZE],
+                    "query": "",
+                    "house": None,
+                    "sort": "name",
+                    "houses": HOUSES,
+                    "next_url": "/lions?after=x",
+                    "next_fragment_url": "/lions/page?after=x",
+                },
+            )
+            report("trail.html", lion_count, 0, {"lions": cards, "total_stops": len(cards)})
+            report(
+                "admin_lion_qr_pdf.html",
+                lion_count,
+                0,
+                {"lions": [{"lion": lion, "qr_base64": "iVBORw0KGgo="} for lion in lions], "generated_at": datetime.now(HKT_TZ)},
+            )
+            for bid_count in args.bids:
+                bids = synthetic_bids(lions, bid_count)
+                report(
+                    "lion_detail.html",
+                    lion_count,
+                    bid_count,
+                    {
+                        "lion": {**cards[0], "bidding_open": True},
+                        "bids": bids[: lion_app.LION_DETAIL_BID_LIMIT],
+                        "form": lion_app.LionBidForm(),
+                        "bidding_open": True,
+                        "current_time": datetime.now(timezone.utc),
+                    },
+                )
+                report(
+                    "admin_dashboard.html",
+                    lion_count,
+                    bid_count,
+                    {
+                        "lions": cards,
+                        "bids": bids,
+                        "bid_summaries": bid_summaries(cards, bids),
+                        "metrics": {
+                            "total_lions": lion_count,
+                            "total_bids": bid_count,
+                            "unique_bidders": bid_count,
+                            "highest_bid": max(bid["amount"] for bid in bids),
+                        },
+                    },
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
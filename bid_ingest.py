@@ -0,0 +1,84 @@
+"""Group-commit bid ingestion for closing-minute bursts.
+
+Request threads hand accepted-looking bids to a single flusher thread, which
+collects them for a few milliseconds and writes the whole batch with
+``record_bid_batch``. Each caller still blocks until its own bid has been
+accepted or rejected. Lions whose price update failed after their bids were
+stored are handed to ``repair_current_bid`` when one is given.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+from db import record_bid_batch
+
+BID_BATCH_WINDOW_MS = float(os.environ.get("BID_BATCH_WINDOW_MS", "5"))
+BID_BATCH_MAX_SIZE = int(os.environ.get("BID_BATCH_MAX_SIZE", "200"))
+
+
+class BidIngestor:
+    def __init__(
+        self,
+        window_ms: float = BID_BATCH_WINDOW_MS,
+        max_batch: int = BID_BATCH_MAX_SIZE,
+        repair_current_bid: Optional[Callable[[str], None]] = None,
+    ):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.repair_current_bid = repair_current_bid
+        self._queue: "queue.Queue[tuple[dict, Future]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, bid_document: dict, timeout: float = 10.0) -> bool:
+        """Queue a bid and wait for its batch to be written; returns True if accepted.
+
+        Raises ``TimeoutError`` after ``timeout`` seconds. The bid stays
+        queued, so it may still be written after the caller has given up.
+        """
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((bid_document, future))
+        return future.result(timeout=timeout)
+
+    def _ensure_started(self) -> None:
+        # Started lazily so the thread is created in the worker, not a preloading master.
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="bid-ingestor", daemon=True)
+            self._thread.start()
+
+    def _next_batch(self) -> list[tuple[dict, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            try:
+                results, stale_lion_ids = record_bid_batch([bid for bid, _ in batch])
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            if self.repair_current_bid:
+                for lion_id in stale_lion_ids:
+                    self.repair_current_bid(lion_id)
+            for (_, future), accepted in zip(batch, results):
+                future.set_result(accepted)
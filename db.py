@@ -1,12 +1,20 @@
 import os
+import re
+from contextvars import ContextVar, Token
 from datetime import datetime, timezone
+from functools import wraps
 from typing import List, Optional
 
 from dotenv import load_dotenv
-from pymongo import ASCENDING, DESCENDING, MongoClient
+import pymongo
+from pymongo import ASCENDING, DESCENDING, TEXT, InsertOne, MongoClient, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, ConnectionFailure, ExecutionTimeout, OperationFailure
+from pymongo.read_preferences import SecondaryPreferred
 from bson import ObjectId
 from gridfs import GridFS
 
+from resilience import CircuitBreaker, CircuitOpenError, SnapshotStore
+
 load_dotenv()
 
 MONGODB_URI = os.environ.get("MONGODB_URI", "mongodb://localhost:27017")
@@ -15,22 +23,231 @@ MONGODB_DB = os.environ.get("MONGODB_DB", "lion-auction")
 client = MongoClient(MONGODB_URI)
 db = client[MONGODB_DB]
 
+# Budget for each guarded call (public reads and bid writes), so an unreachable
+# cluster fails a page in seconds, not after the 30s server-selection default.
+# Admin aggregations, imports and migrations keep the client's defaults.
+MONGODB_FAIL_FAST_TIMEOUT_SECONDS = int(os.environ.get("MONGODB_FAIL_FAST_TIMEOUT_MS", "3000")) / 1000
+
 lions_collection = db["lions"]
 bids_collection = db["bids"]
+results_collection = db["auction_results"]
+migrations_collection = db["migrations"]
+unresolved_bid_refs_collection = db["unresolved_bid_refs"]
 lion_images_fs = GridFS(db, collection="lion_images")
+lion_image_files_collection = db["lion_images.files"]
+
+# Most recent bids shown on a lion page, live or from its frozen result.
+LION_DETAIL_BID_LIMIT = int(os.environ.get("LION_DETAIL_BID_LIMIT", "10"))
+
+# Public page reads may be served by a secondary lagging at most this far
+# behind the primary (MongoDB requires at least 90 seconds).
+MONGODB_MAX_STALENESS_SECONDS = int(os.environ.get("MONGODB_MAX_STALENESS_SECONDS", "90"))
+_secondary_db = db.with_options(
+    read_preference=SecondaryPreferred(max_staleness=MONGODB_MAX_STALENESS_SECONDS)
+)
+_secondary_collections = {
+    name: _secondary_db[name] for name in ("lions", "bids", "auction_results")
+}
+_secondary_lion_images_fs = GridFS(_secondary_db, collection="lion_images")
+_secondary_reads: ContextVar[bool] = ContextVar("secondary_reads", default=False)
+
+
+def route_reads_to_secondaries(enabled: bool = True) -> Token:
+    """Let public read helpers use secondaries in the current context.
+
+    Reads stay on the primary unless this is called, so background threads,
+    CLI commands, bid placement and admin views are unaffected. Pass the
+    returned token to :func:`reset_read_routing` when the request ends.
+    """
+    return _secondary_reads.set(enabled)
+
+
+def reset_read_routing(token: Token) -> None:
+    _secondary_reads.reset(token)
+
+
+def _reads(collection):
+    return _secondary_collections[collection.name] if _secondary_reads.get() else collection
+
+
+def _image_reads() -> GridFS:
+    return _secondary_lion_images_fs if _secondary_reads.get() else lion_images_fs
+
+
+class DatabaseUnavailable(Exception):
+    """MongoDB is unreachable (or the circuit is open) and no snapshot can stand in."""
+
+
+DATABASE_FAILURES = (ConnectionFailure, ExecutionTimeout)
+breaker = CircuitBreaker()
+snapshots = SnapshotStore()
+_served_stale: ContextVar[bool] = ContextVar("served_stale", default=False)
+
+
+def database_available() -> bool:
+    return not breaker.is_open
+
+
+def served_stale_data() -> bool:
+    """True if a read in the current context was answered from a snapshot."""
+    return _served_stale.get()
+
+
+def clear_stale_flag() -> None:
+    _served_stale.set(False)
+
 
+def _fail_fast(func, *args, **kwargs):
+    with pymongo.timeout(MONGODB_FAIL_FAST_TIMEOUT_SECONDS):
+        return breaker.call(func, *args, failures=DATABASE_FAILURES, **kwargs)
 
+
+def _guarded(func):
+    """Run through the circuit breaker; raise DatabaseUnavailable instead of blocking."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return _fail_fast(func, *args, **kwargs)
+        except (CircuitOpenError, *DATABASE_FAILURES) as exc:
+            raise DatabaseUnavailable(func.__name__) from exc
+
+    return wrapper
+
+
+def _snapshotted(func=None, *, save_empty=False, skip_save=None):
+    """Like ``_guarded``, but fall back to the last known-good result for the same arguments.
+
+    Empty results are only saved with ``save_empty``, and
+    ``skip_save(*args, **kwargs)`` can veto saving for argument shapes that
+    would let callers create unbounded keys.
+    """
+    if func is None:
+        return lambda inner: _snapshotted(inner, save_empty=save_empty, skip_save=skip_save)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        key = f"{func.__name__}:{args!r}:{sorted(kwargs.items())!r}"
+        try:
+            result = _fail_fast(func, *args, **kwargs)
+        except (CircuitOpenError, *DATABASE_FAILURES) as exc:
+            found, snapshot = snapshots.load(key)
+            if not found:
+                raise DatabaseUnavailable(func.__name__) from exc
+            _served_stale.set(True)
+            return snapshot
+        empty = result is None or result == [] or (isinstance(result, tuple) and not result[0])
+        if (save_empty or not empty) and not (skip_save and skip_save(*args, **kwargs)):
+            snapshots.save(key, result)
+        return result
+
+    return wrapper
+
+
+@_snapshotted
 def get_lions(limit: Optional[int] = None, sort_field: str = "name", direction: int = ASCENDING) -> List[dict]:
-    cursor = lions_collection.find().sort(sort_field, direction)
+    cursor = _reads(lions_collection).find().sort(sort_field, direction)
     if limit:
         cursor = cursor.limit(limit)
     return list(cursor)
 
 
+# Server error code for a $text query with no text index on the collection.
+INDEX_NOT_FOUND = 27
+
+
+@_guarded
+def search_lions(
+    query: str = "",
+    house: Optional[str] = None,
+    page: int = 1,
+    per_page: int = 24,
+) -> tuple[List[dict], int]:
+    """Return one page of lions and the total match count.
+
+    A ``query`` uses the ``lions`` text index over name, house and summary and
+    ranks by text score; without one, lions are listed by name. Until
+    ``ensure_indexes`` has created the text index, queries fall back to an
+    unranked case-insensitive substring match.
+    """
+    filters: dict = {}
+    if house:
+        filters["house"] = house
+    lions = _reads(lions_collection)
+    skip = (max(page, 1) - 1) * per_page
+    if query:
+        text_filters = {**filters, "$text": {"$search": query}}
+        try:
+            total = lions.count_documents(text_filters)
+            cursor = lions.find(text_filters, {"score": {"$meta": "textScore"}}).sort(
+                [("score", {"$meta": "textScore"}), ("name", ASCENDING)]
+            )
+            return list(cursor.skip(skip).limit(per_page)), total
+        except OperationFailure as exc:
+            if exc.code != INDEX_NOT_FOUND:
+                raise
+        pattern = {"$regex": re.escape(query), "$options": "i"}
+        filters["$or"] = [{"name": pattern}, {"house": pattern}, {"summary": pattern}]
+    total = lions.count_documents(filters)
+    cursor = lions.find(filters).sort("name", ASCENDING).skip(skip).limit(per_page)
+    return list(cursor), total
+
+
+LION_PAGE_SORTS = {
+    # sort key -> (field, direction); ties are broken on _id in the same direction.
+    "name": ("name", ASCENDING),
+    "bid": ("current_bid", DESCENDING),
+}
+
+
+@_snapshotted(skip_save=lambda sort="name", after=None, *args, **kwargs: after is not None)
+def get_lions_page(
+    sort: str = "name",
+    after: Optional[tuple] = None,
+    limit: int = 24,
+    house: Optional[str] = None,
+) -> tuple[List[dict], Optional[tuple]]:
+    """Keyset-paginate lions on ``(field, _id)``.
+
+    ``after`` is the ``(value, _id)`` of the last lion on the previous page.
+    Returns the page and the key to pass as ``after`` for the next one, or
+    None when this is the last page.
+    """
+    field, direction = LION_PAGE_SORTS.get(sort, LION_PAGE_SORTS["name"])
+    filters: dict = {"house": house} if house else {}
+    if after is not None:
+        value, last_id = after
+        beyond = "$gt" if direction == ASCENDING else "$lt"
+        filters["$or"] = [{field: {beyond: value}}, {field: value, "_id": {beyond: last_id}}]
+    cursor = _reads(lions_collection).find(filters).sort([(field, direction), ("_id", direction)]).limit(limit + 1)
+    lions = list(cursor)
+    if len(lions) <= limit:
+        return lions, None
+    lions = lions[:limit]
+    return lions, (lions[-1].get(field), lions[-1]["_id"])
+
+
+@_snapshotted
+def get_lion_houses() -> List[str]:
+    return sorted(house for house in _reads(lions_collection).distinct("house") if house)
+
+
 def get_lions_by_bid(limit: int = 2) -> List[dict]:
     return get_lions(limit=limit, sort_field="current_bid", direction=DESCENDING)
 
 
+@_snapshotted
+def get_total_raised() -> int:
+    result = next(_reads(bids_collection).aggregate([{"$group": {"_id": None, "total": {"$sum": "$amount"}}}]), None)
+    return int(result["total"]) if result else 0
+
+
+@_snapshotted
+def get_top_bid() -> Optional[dict]:
+    """The single highest bid placed, via the ``bids.amount`` index."""
+    return _reads(bids_collection).find_one(sort=[("amount", DESCENDING)])
+
+
 def get_bids(limit: Optional[int] = None, sort_field: str = "timestamp", direction: int = DESCENDING) -> List[dict]:
     cursor = bids_collection.find().sort(sort_field, direction)
     if limit:
@@ -38,12 +255,151 @@ def get_bids(limit: Optional[int] = None, sort_field: str = "timestamp", directi
     return list(cursor)
 
 
+def _first(array_path: str) -> dict:
+    return {"$arrayElemAt": [array_path, 0]}
+
+
+# Callers look the lion up first, so empty bid lists are only saved for real lions.
+@_snapshotted(save_empty=True)
+def get_bids_for_lion(lion_id: str, limit: Optional[int] = None) -> List[dict]:
+    cursor = _reads(bids_collection).find({"lion_id": lion_id}).sort("timestamp", DESCENDING)
+    if limit:
+        cursor = cursor.limit(limit)
+    return list(cursor)
+
+
+def get_bid_statistics() -> dict:
+    """Summarize all bids in one aggregation: overall metrics plus one row per lion.
+
+    Only the summarized rows leave the database. Bids are grouped by
+    ``lion_id``; run ``backfill_bid_lion_ids`` first on data with legacy refs.
+    """
+    pipeline = [
+        {
+            "$facet": {
+                "totals": [
+                    {"$group": {"_id": None, "total_bids": {"$sum": 1}, "highest_bid": {"$max": "$amount"}}},
+                ],
+                "bidders": [
+                    {"$match": {"bidder": {"$nin": [None, ""]}}},
+                    {"$group": {"_id": "$bidder"}},
+                    {"$count": "unique_bidders"},
+                ],
+                "by_lion": [
+                    {
+                        "$group": {
+                            "_id": "$lion_id",
+                            "total_bids": {"$sum": 1},
+                            # Embedded documents compare field by field, so this keeps the top amount.
+                            "highest_bid": {
+                                "$max": {"amount": "$amount", "bidder": "$bidder", "timestamp": "$timestamp", "_id": "$_id"}
+                            },
+                            "fallback_name": {"$first": {"$ifNull": ["$lion_name", "$lion"]}},
+                        }
+                    },
+                    {"$addFields": {"lion_oid": {"$convert": {"input": "$_id", "to": "objectId", "onError": None, "onNull": None}}}},
+                    {"$lookup": {"from": "lions", "localField": "lion_oid", "foreignField": "_id", "as": "lion_docs"}},
+                    {
+                        "$project": {
+                            "_id": 0,
+                            "lion_id": "$_id",
+                            "lion_name": {"$ifNull": [_first("$lion_docs.name"), "$fallback_name"]},
+                            "total_bids": 1,
+                            "highest_bid": 1,
+                        }
+                    },
+                    {"$sort": {"lion_name": ASCENDING}},
+                ],
+            }
+        }
+    ]
+    result = next(bids_collection.aggregate(pipeline), {})
+    totals = (result.get("totals") or [{}])[0]
+    bidders = (result.get("bidders") or [{}])[0]
+    return {
+        "total_bids": totals.get("total_bids", 0),
+        "highest_bid": totals.get("highest_bid") or 0,
+        "unique_bidders": bidders.get("unique_bidders", 0),
+        "by_lion": result.get("by_lion") or [],
+    }
+
+
+@_guarded
 def insert_bid(bid_data: dict) -> str:
     result = bids_collection.insert_one(bid_data)
     return str(result.inserted_id)
 
 
+@_guarded
+def record_bid_batch(bid_documents: List[dict]) -> tuple[List[bool], List[str]]:
+    """Insert a burst of bids with one bulk write per collection.
+
+    Bids are checked in arrival order against the lion's current bid and any
+    earlier bid in the same batch; only bids that raise the price on a lion
+    still open for bidding are stored. Returns whether each bid was stored, and the lions whose ``current_bid``
+    could not be raised afterwards and needs repairing.
+    """
+    lion_oids = {}
+    for bid in bid_documents:
+        try:
+            lion_oids[bid["lion_id"]] = ObjectId(bid["lion_id"])
+        except Exception:
+            continue
+    # The batch may be written after a lion closed, so re-check the window here.
+    still_open = {"_id": {"$in": list(lion_oids.values())}, "bidding_ends_at": {"$not": {"$lt": datetime.now(timezone.utc)}}}
+    current = {
+        str(lion["_id"]): int(lion.get("current_bid") or 0) for lion in lions_collection.find(still_open, {"current_bid": 1})
+    }
+
+    accepted: List[bool] = []
+    positions = []
+    for position, bid in enumerate(bid_documents):
+        lion_id = bid.get("lion_id")
+        is_higher = lion_id in current and bid.get("amount", 0) > current[lion_id]
+        if is_higher:
+            current[lion_id] = bid["amount"]
+            positions.append(position)
+        accepted.append(is_higher)
+    if not positions:
+        return accepted, []
+
+    try:
+        bids_collection.bulk_write([InsertOne(bid_documents[position]) for position in positions], ordered=False)
+    except BulkWriteError as exc:
+        # Unordered, so every insert without its own write error was stored.
+        for error in exc.details.get("writeErrors", []):
+            accepted[positions[error["index"]]] = False
+
+    highest: dict[str, int] = {}
+    for position in positions:
+        if accepted[position]:
+            bid = bid_documents[position]
+            highest[bid["lion_id"]] = max(highest.get(bid["lion_id"], 0), bid["amount"])
+    if not highest:
+        return accepted, []
+    try:
+        lions_collection.bulk_write(
+            [UpdateOne({"_id": lion_oids[lion_id]}, {"$max": {"current_bid": amount}}) for lion_id, amount in highest.items()],
+            ordered=False,
+        )
+    except (BulkWriteError, *DATABASE_FAILURES):
+        # The bids are stored, so report them as accepted; $max makes the repair safe to repeat.
+        return accepted, list(highest)
+    return accepted, []
+
+
+@_guarded
 def update_lion_current_bid(lion_id: str, amount: int) -> None:
+    """Raise ``current_bid`` to ``amount``; concurrent or late writes never lower it."""
+    try:
+        lion_oid = ObjectId(lion_id)
+    except Exception:
+        return
+    lions_collection.update_one({"_id": lion_oid}, {"$max": {"current_bid": amount}})
+
+
+def set_lion_current_bid(lion_id: str, amount: int) -> None:
+    """Overwrite ``current_bid``, e.g. after an admin deletes the top bid."""
     try:
         lion_oid = ObjectId(lion_id)
     except Exception:
@@ -51,6 +407,27 @@ def update_lion_current_bid(lion_id: str, amount: int) -> None:
     lions_collection.update_one({"_id": lion_oid}, {"$set": {"current_bid": amount}})
 
 
+def reconcile_current_bids() -> int:
+    """Raise each unfinalized lion's ``current_bid`` to its highest stored bid.
+
+    Repairs lions whose price update failed after their bid was stored.
+    Returns the number of lions changed.
+    """
+    lion_ids = [str(lion["_id"]) for lion in lions_collection.find({"finalized_at": None}, {"_id": 1})]
+    if not lion_ids:
+        return 0
+    highest = bids_collection.aggregate(
+        [
+            {"$match": {"lion_id": {"$in": lion_ids}}},
+            {"$group": {"_id": "$lion_id", "amount": {"$max": "$amount"}}},
+        ]
+    )
+    updates = [UpdateOne({"_id": ObjectId(row["_id"])}, {"$max": {"current_bid": row["amount"]}}) for row in highest]
+    if not updates:
+        return 0
+    return lions_collection.bulk_write(updates, ordered=False).modified_count
+
+
 def load_temp_demo_data() -> None:
 
     lions_payload = [
@@ -206,19 +583,40 @@ def load_temp_demo_data() -> None:
         bids_collection.insert_many(bids_payload)
 
 
+@_snapshotted
 def get_lion_by_id(lion_id: str) -> Optional[dict]:
     try:
         oid = ObjectId(lion_id)
     except Exception:
         return None
-    return lions_collection.find_one({"_id": oid})
+    return _reads(lions_collection).find_one({"_id": oid})
+
+
+def _with_current_bid(lion_data: dict) -> dict:
+    # Catalogue keyset pagination on current_bid skips lions where it is null or missing.
+    if lion_data.get("current_bid") is None:
+        lion_data["current_bid"] = 0
+    return lion_data
 
 
 def insert_lion(lion_data: dict) -> str:
-    result = lions_collection.insert_one(lion_data)
+    result = lions_collection.insert_one(_with_current_bid(lion_data))
     return str(result.inserted_id)
 
 
+def insert_lions(lion_documents: List[dict]) -> List[str]:
+    """Insert many lions in one unordered write; returns the ids that were stored.
+
+    A document rejected by the server does not stop the others.
+    """
+    try:
+        result = lions_collection.insert_many([_with_current_bid(document) for document in lion_documents], ordered=False)
+        return [str(inserted_id) for inserted_id in result.inserted_ids]
+    except BulkWriteError as exc:
+        rejected = {error["index"] for error in exc.details.get("writeErrors", [])}
+        return [str(document["_id"]) for index, document in enumerate(lion_documents) if index not in rejected]
+
+
 def delete_lion(lion_id: str) -> bool:
     try:
         lion_oid = ObjectId(lion_id)
@@ -230,10 +628,8 @@ def delete_lion(lion_id: str) -> bool:
     lion = lions_collection.find_one({"_id": lion_oid})
     if lion:
         for image_id in lion.get("image_ids", []):
-            try:
-                lion_images_fs.delete(image_id)
-            except Exception:
-                pass
+            _release_lion_image(lion_oid, image_id)
+    results_collection.delete_one({"lion_id": lion_id})
     result = lions_collection.delete_one({"_id": lion_oid})
     return result.deleted_count > 0
 
@@ -243,11 +639,27 @@ def update_lion(lion_id: str, lion_data: dict) -> bool:
         oid = ObjectId(lion_id)
     except Exception:
         return False
+    if "current_bid" in lion_data:
+        _with_current_bid(lion_data)
     update_result = lions_collection.update_one({"_id": oid}, {"$set": lion_data})
     return update_result.modified_count > 0
 
 
+def find_lion_image_by_hash(source_sha256: str) -> Optional[ObjectId]:
+    """Return the stored image whose original upload had this SHA-256, if any."""
+    file_doc = lion_image_files_collection.find_one({"source_sha256": source_sha256}, {"_id": 1})
+    return file_doc["_id"] if file_doc else None
+
+
 def add_lion_images(lion_id: str, files: List[dict]) -> List[str]:
+    """Attach uploads to a lion.
+
+    Payloads with ``content`` are stored as new GridFS files; payloads with
+    ``existing_id`` (a duplicate of an earlier upload) add this lion as another
+    owner of that file instead. If that file has meanwhile lost its last owner
+    and is being deleted, ``fresh_copy()`` is called for a ``content`` payload
+    to store in its place.
+    """
     try:
         lion_oid = ObjectId(lion_id)
     except Exception:
@@ -255,21 +667,53 @@ def add_lion_images(lion_id: str, files: List[dict]) -> List[str]:
 
     stored_ids: List[str] = []
     for file_payload in files:
-        content = file_payload.get("content")
-        if not content:
-            continue
-        file_id = lion_images_fs.put(
-            content,
-            filename=file_payload.get("filename"),
-            lion_id=lion_oid,
-            content_type=file_payload.get("content_type"),
-            uploaded_at=datetime.now(timezone.utc),
-        )
+        file_id = file_payload.get("existing_id")
+        if file_id is not None:
+            # Only join a file that still has an owner; an ownerless one is about to be deleted.
+            claimed = lion_image_files_collection.update_one(
+                {"_id": file_id, "lion_ids.0": {"$exists": True}}, {"$addToSet": {"lion_ids": lion_oid}}
+            )
+            if not claimed.matched_count:
+                file_id, file_payload = None, file_payload["fresh_copy"]()
+        if file_id is None:
+            content = file_payload.get("content")
+            if not content:
+                continue
+            file_id = lion_images_fs.put(
+                content,
+                filename=file_payload.get("filename"),
+                lion_id=lion_oid,
+                lion_ids=[lion_oid],
+                source_sha256=file_payload.get("source_sha256"),
+                content_type=file_payload.get("content_type"),
+                uploaded_at=datetime.now(timezone.utc),
+            )
         stored_ids.append(str(file_id))
         lions_collection.update_one({"_id": lion_oid}, {"$addToSet": {"image_ids": file_id}})
     return stored_ids
 
 
+def _lion_image_owner_filter(lion_oid: ObjectId) -> dict:
+    # Files uploaded before deduplication only carry the single ``lion_id`` owner.
+    return {"$or": [{"lion_ids": lion_oid}, {"lion_id": lion_oid, "lion_ids": {"$exists": False}}]}
+
+
+def _release_lion_image(lion_oid: ObjectId, image_oid: ObjectId) -> None:
+    """Drop one lion's reference to an image and delete the file once nobody owns it."""
+    file_doc = lion_image_files_collection.find_one_and_update(
+        {"_id": image_oid},
+        {"$pull": {"lion_ids": lion_oid}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if not file_doc:
+        return
+    owners = file_doc.get("lion_ids")
+    if owners is None:
+        owners = [] if file_doc.get("lion_id") == lion_oid else [file_doc.get("lion_id")]
+    if not owners:
+        lion_images_fs.delete(image_oid)
+
+
 def get_lion_images(lion_id: str) -> List[dict]:
     try:
         lion_oid = ObjectId(lion_id)
@@ -277,7 +721,7 @@ def get_lion_images(lion_id: str) -> List[dict]:
         return []
 
     images = []
-    for file_obj in lion_images_fs.find({"lion_id": lion_oid}).sort("uploadDate", ASCENDING):
+    for file_obj in _image_reads().find(_lion_image_owner_filter(lion_oid)).sort("uploadDate", ASCENDING):
         images.append(
             {
                 "id": str(file_obj._id),
@@ -290,6 +734,7 @@ def get_lion_images(lion_id: str) -> List[dict]:
     return images
 
 
+@_guarded
 def get_lion_image_file(lion_id: str, image_id: str):
     try:
         lion_oid = ObjectId(lion_id)
@@ -298,11 +743,14 @@ def get_lion_image_file(lion_id: str, image_id: str):
         return None
 
     try:
-        file_obj = lion_images_fs.get(image_oid)
+        file_obj = _image_reads().get(image_oid)
     except Exception:
         return None
 
-    if getattr(file_obj, "lion_id", None) != lion_oid:
+    owners = getattr(file_obj, "lion_ids", None)
+    if owners is None:
+        owners = [getattr(file_obj, "lion_id", None)]
+    if lion_oid not in owners:
         return None
     return file_obj
 
@@ -313,7 +761,7 @@ def delete_lion_image(lion_id: str, image_id: str) -> bool:
         return False
 
     lion_oid = ObjectId(lion_id)
-    lion_images_fs.delete(file_obj._id)
+    _release_lion_image(lion_oid, file_obj._id)
     lions_collection.update_one({"_id": lion_oid}, {"$pull": {"image_ids": file_obj._id}})
     return True
 
@@ -353,4 +801,192 @@ def clear_database() -> dict:
 
     deleted_lions = lions_collection.delete_many({}).deleted_count
     deleted_bids = bids_collection.delete_many({}).deleted_count
-    return {"lions": deleted_lions, "bids": deleted_bids, "images": deleted_images}
\ No newline at end of file
+    results_collection.delete_many({})
+    return {"lions": deleted_lions, "bids": deleted_bids, "images": deleted_images}
+
+
+def lion_status(starts_at: Optional[datetime], ends_at: Optional[datetime], now: Optional[datetime] = None) -> str:
+    """``upcoming`` before ``starts_at``, ``closed`` after ``ends_at``, otherwise ``open``."""
+    now = now or datetime.now(timezone.utc)
+    starts_at, ends_at = (
+        value.replace(tzinfo=timezone.utc) if value and value.tzinfo is None else value for value in (starts_at, ends_at)
+    )
+    if ends_at and now > ends_at:
+        return "closed"
+    if starts_at and now < starts_at:
+        return "upcoming"
+    return "open"
+
+
+@_guarded
+def get_next_status_transition(now: datetime) -> Optional[datetime]:
+    """When the next lion opens or closes; page caches can expire exactly then."""
+    candidates = []
+    for field in ("bidding_starts_at", "bidding_ends_at"):
+        lion = lions_collection.find_one({field: {"$gt": now}}, sort=[(field, ASCENDING)], projection={field: 1})
+        if lion:
+            candidates.append(lion[field])
+    return min(candidates) if candidates else None
+
+
+@_guarded
+def get_lions_changing_status(now: datetime, until: datetime) -> List[dict]:
+    """Lions that open or close in ``(now, until]``, e.g. within the next hour."""
+    window = {"$gt": now, "$lte": until}
+    cursor = lions_collection.find({"$or": [{"bidding_starts_at": window}, {"bidding_ends_at": window}]})
+    return list(cursor.sort("name", ASCENDING))
+
+
+def get_lions_due_for_finalization(now: datetime) -> List[dict]:
+    return list(lions_collection.find({"bidding_ends_at": {"$lte": now}, "finalized_at": None}))
+
+
+def finalize_lion(lion: dict, recent_bid_count: int = LION_DETAIL_BID_LIMIT) -> dict:
+    """Freeze the lion's bids into an ``auction_results`` document and mark it closed.
+
+    Safe to run concurrently from several workers: the result document is
+    upserted by ``lion_id`` and the lion is only stamped once.
+    """
+    lion_id = str(lion["_id"])
+    bids = list(bids_collection.find({"lion_id": lion_id}).sort("timestamp", DESCENDING))
+    winning_bid = max(bids, key=lambda bid: bid.get("amount", 0), default=None)
+    finalized_at = datetime.now(timezone.utc)
+    result = {
+        "lion_id": lion_id,
+        "lion_name": lion.get("name"),
+        "closed_at": lion.get("bidding_ends_at"),
+        "finalized_at": finalized_at,
+        "final_bid": int(winning_bid.get("amount", 0)) if winning_bid else int(lion.get("current_bid") or 0),
+        "winning_bid": winning_bid,
+        "total_bids": len(bids),
+        "total_pledged": sum(bid.get("amount", 0) for bid in bids),
+        "unique_bidders": len({bid.get("bidder") for bid in bids if bid.get("bidder")}),
+        "recent_bids": [
+            {"bidder": bid.get("bidder"), "amount": bid.get("amount", 0), "timestamp": bid.get("timestamp")}
+            for bid in bids[:recent_bid_count]
+        ],
+    }
+    results_collection.replace_one({"lion_id": lion_id}, result, upsert=True)
+    lions_collection.update_one(
+        {"_id": lion["_id"], "finalized_at": None},
+        {"$set": {"finalized_at": finalized_at}},
+    )
+    return result
+
+
+@_snapshotted
+def get_auction_result(lion_id: str) -> Optional[dict]:
+    return _reads(results_collection).find_one({"lion_id": lion_id})
+
+
+def reopen_lion(lion_id: str) -> None:
+    """Discard a lion's frozen result so it is finalized again from live bids."""
+    try:
+        lion_oid = ObjectId(lion_id)
+    except Exception:
+        return
+    results_collection.delete_one({"lion_id": lion_id})
+    lions_collection.update_one({"_id": lion_oid}, {"$set": {"finalized_at": None}})
+
+
+def ensure_indexes() -> None:
+    lions_collection.create_index([("name", ASCENDING), ("_id", ASCENDING)])
+    lions_collection.create_index([("current_bid", DESCENDING), ("_id", DESCENDING)])
+    lions_collection.update_many({"current_bid": None}, {"$set": {"current_bid": 0}})
+    lions_collection.create_index("bidding_starts_at")
+    lions_collection.create_index("bidding_ends_at")
+    lions_collection.create_index(
+        [("name", TEXT), ("house", TEXT), ("summary", TEXT)],
+        weights={"name": 10, "house": 5, "summary": 1},
+        name="lion_search",
+    )
+    bids_collection.create_index([("lion_id", ASCENDING), ("timestamp", DESCENDING)])
+    bids_collection.create_index([("lion_id", ASCENDING), ("amount", DESCENDING)])
+    bids_collection.create_index([("timestamp", DESCENDING)])
+    bids_collection.create_index([("amount", DESCENDING)])
+    results_collection.create_index("lion_id", unique=True)
+    lion_image_files_collection.create_index("source_sha256", sparse=True)
+    lion_image_files_collection.create_index("lion_ids")
+
+
+BID_LION_REFS_MIGRATION = "bid_lion_refs"
+
+
+def backfill_bid_lion_ids(batch_size: int = 1000, restart: bool = False, progress=None) -> dict:
+    """Resolve legacy bids (``lion_name``/``lion``/slug only) to a ``lion_id``.
+
+    Works through bids in ``_id`` order in chunks of ``batch_size``, writing
+    each chunk with one ``bulk_write`` and checkpointing the last processed
+    ``_id`` in ``migrations``, so an interrupted run resumes where it stopped.
+    Bids that match no lion, or whose ref names more than one lion, are
+    recorded in ``unresolved_bid_refs``.
+    ``progress`` is called with the running state after every chunk.
+    """
+    if restart:
+        migrations_collection.delete_one({"_id": BID_LION_REFS_MIGRATION})
+    state = migrations_collection.find_one({"_id": BID_LION_REFS_MIGRATION}) or {
+        "_id": BID_LION_REFS_MIGRATION,
+        "last_id": None,
+        "processed": 0,
+        "resolved": 0,
+        "unresolved": 0,
+        "started_at": datetime.now(timezone.utc),
+    }
+
+    lion_refs: dict[str, dict] = {}
+    ambiguous_refs: set = set()
+    for lion in lions_collection.find({}, {"name": 1, "slug": 1}):
+        for ref in (lion.get("slug"), lion.get("name")):
+            if ref and lion_refs.setdefault(ref, lion)["_id"] != lion["_id"]:
+                ambiguous_refs.add(ref)
+
+    missing_lion_id = {"$or": [{"lion_id": {"$exists": False}}, {"lion_id": None}, {"lion_id": ""}]}
+    while True:
+        query = dict(missing_lion_id)
+        if state["last_id"] is not None:
+            query["_id"] = {"$gt": state["last_id"]}
+        chunk = list(bids_collection.find(query, {"lion": 1, "lion_name": 1}).sort("_id", ASCENDING).limit(batch_size))
+        if not chunk:
+            break
+
+        updates = []
+        unresolved = []
+        for bid in chunk:
+            ref = bid.get("lion_name") or bid.get("lion")
+            lion = lion_refs.get(ref) if ref and ref not in ambiguous_refs else None
+            if lion:
+                updates.append(
+                    UpdateOne({"_id": bid["_id"]}, {"$set": {"lion_id": str(lion["_id"]), "lion_name": lion.get("name")}})
+                )
+            else:
+                unresolved.append(
+                    UpdateOne(
+                        {"bid_id": bid["_id"]},
+                        {
+                            "$set": {
+                                "bid_id": bid["_id"],
+                                "ref": ref,
+                                "reason": "ambiguous" if ref in ambiguous_refs else "unmatched",
+                                "recorded_at": datetime.now(timezone.utc),
+                            }
+                        },
+                        upsert=True,
+                    )
+                )
+        if updates:
+            bids_collection.bulk_write(updates, ordered=False)
+        if unresolved:
+            unresolved_bid_refs_collection.bulk_write(unresolved, ordered=False)
+
+        state["last_id"] = chunk[-1]["_id"]
+        state["processed"] += len(chunk)
+        state["resolved"] += len(updates)
+        state["unresolved"] += len(unresolved)
+        state["updated_at"] = datetime.now(timezone.utc)
+        migrations_collection.replace_one({"_id": BID_LION_REFS_MIGRATION}, state, upsert=True)
+        if progress:
+            progress(state)
+
+    state["completed_at"] = datetime.now(timezone.utc)
+    migrations_collection.replace_one({"_id": BID_LION_REFS_MIGRATION}, state, upsert=True)
+    return state
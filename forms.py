@@ -1,6 +1,7 @@
 from decimal import Decimal
 
 from flask_wtf import FlaskForm
+from flask_wtf.file import FileAllowed, FileField, FileRequired
 from wtforms import BooleanField, HiddenField, MultipleFileField, PasswordField, StringField, TextAreaField, IntegerField
 from wtforms.fields import DecimalField, DateTimeLocalField
 from wtforms.validators import DataRequired, Email, Length, NumberRange, Optional
@@ -35,3 +36,11 @@ class AdminLionForm(FlaskForm):
     bidding_starts_at = DateTimeLocalField("Bidding opens", format="%Y-%m-%dT%H:%M", validators=[Optional()])
     bidding_ends_at = DateTimeLocalField("Bidding ends", format="%Y-%m-%dT%H:%M", validators=[Optional()])
     images = MultipleFileField("Lion images", validators=[Optional()])
+
+
+class AdminLionImportForm(FlaskForm):
+    sheet = FileField(
+        "Lion sheet (CSV or JSON)",
+        validators=[FileRequired(), FileAllowed(["csv", "json"], "Upload a .csv or .json file.")],
+    )
+    images = FileField("Images (zip)", validators=[Optional(), FileAllowed(["zip"], "Upload a .zip of images.")])
@@ -0,0 +1,65 @@
+"""Per-worker top-K ranking of lions by ``current_bid``.
+
+The ranking is loaded with an index-backed ``get_lions_by_bid`` query and then
+kept current by :meth:`Leaderboard.record_bid` for every bid this worker
+accepts. A periodic refresh picks up bids accepted by other workers.
+"""
+
+import os
+import threading
+import time
+from typing import List, Optional
+
+from db import get_lion_by_id, get_lions_by_bid
+
+LEADERBOARD_SIZE = int(os.environ.get("LEADERBOARD_SIZE", "10"))
+LEADERBOARD_REFRESH_SECONDS = float(os.environ.get("LEADERBOARD_REFRESH_SECONDS", "10"))
+
+
+class Leaderboard:
+    def __init__(self, size: int = LEADERBOARD_SIZE, refresh_seconds: float = LEADERBOARD_REFRESH_SECONDS):
+        self.size = size
+        self.refresh_seconds = refresh_seconds
+        self._entries: List[dict] = []
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def top(self, limit: Optional[int] = None) -> List[dict]:
+        """Return copies of the highest-bid lions, best first."""
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_seconds:
+            self.refresh()
+        with self._lock:
+            return [dict(entry) for entry in self._entries[: limit or self.size]]
+
+    def refresh(self) -> None:
+        entries = get_lions_by_bid(limit=self.size)
+        with self._lock:
+            self._entries = entries
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def record_bid(self, lion_id: str, amount: int) -> None:
+        """Apply an accepted bid without re-querying the whole ranking."""
+        with self._lock:
+            entry = next((entry for entry in self._entries if str(entry["_id"]) == lion_id), None)
+            if entry is not None:
+                entry["current_bid"] = max(int(entry.get("current_bid") or 0), amount)
+                self._sort()
+                return
+            qualifies = len(self._entries) < self.size or amount > int(self._entries[-1].get("current_bid") or 0)
+        if not qualifies:
+            return
+        lion = get_lion_by_id(lion_id)
+        if not lion:
+            return
+        lion["current_bid"] = max(int(lion.get("current_bid") or 0), amount)
+        with self._lock:
+            self._entries = [entry for entry in self._entries if str(entry["_id"]) != lion_id]
+            self._entries.append(lion)
+            self._sort()
+
+    def _sort(self) -> None:
+        self._entries.sort(key=lambda entry: int(entry.get("current_bid") or 0), reverse=True)
+        del self._entries[self.size :]
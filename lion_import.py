@@ -0,0 +1,290 @@
+"""Bulk lion import from a CSV or JSON sheet plus an optional zip of images.
+
+Rows are validated up front, images are compressed across a process pool,
+and every valid lion is written with a single ``insert_many``. A bad row or
+image only fails that row. ``import_lions`` yields progress events so the
+admin view can stream them to the browser.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone, tzinfo
+from functools import partial
+from typing import Iterator, List, Optional
+
+from bson import ObjectId
+
+from db import add_lion_images, delete_lion, find_lion_image_by_hash, insert_lions
+from media import compress_image
+
+LION_IMPORT_WORKERS = int(os.environ.get("LION_IMPORT_WORKERS", str(os.cpu_count() or 2)))
+MAX_IMPORT_IMAGE_BYTES = int(os.environ.get("MAX_IMPORT_IMAGE_BYTES", str(25 * 1024 * 1024)))
+IMPORT_IMAGE_EXTENSIONS = {"jpg", "jpeg", "png", "gif", "webp"}
+IMPORT_TIME_FORMATS = ("%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S")
+
+
+def read_lion_rows(filename: str, content: bytes) -> List[dict]:
+    """Parse a CSV (with a header row) or a JSON array of lion objects."""
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        raise ValueError("The lion sheet must be UTF-8 encoded.") from exc
+    if filename.lower().endswith(".json"):
+        try:
+            rows = json.loads(text)
+        except ValueError as exc:
+            raise ValueError(f"Invalid JSON: {exc}") from exc
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValueError("The JSON file must contain an array of lion objects.")
+        return rows
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames or "name" not in [field.strip().lower() for field in reader.fieldnames]:
+        raise ValueError("The CSV needs a header row with at least a 'name' column.")
+    return [{(key or "").strip().lower(): value for key, value in row.items()} for row in reader]
+
+
+def _text(row: dict, field: str) -> str:
+    value = row.get(field)
+    return "" if value is None else str(value).strip()
+
+
+def _parse_local_time(value: str, local_tz: tzinfo) -> datetime:
+    for time_format in IMPORT_TIME_FORMATS:
+        try:
+            return datetime.strptime(value, time_format).replace(tzinfo=local_tz).astimezone(timezone.utc)
+        except ValueError:
+            continue
+    raise ValueError
+
+
+def validate_lion_row(row: dict, local_tz: tzinfo) -> tuple[dict, List[str], List[str]]:
+    """Return ``(lion_document, image_names, errors)`` for one sheet row.
+
+    Bidding times are read in ``local_tz`` (HKT) as ``YYYY-MM-DD HH:MM``.
+    ``images`` is a list (JSON) or ``;``-separated file names in the zip.
+    """
+    errors = []
+    name = _text(row, "name")
+    if not name:
+        errors.append("name is required")
+    elif len(name) > 120:
+        errors.append("name must be at most 120 characters")
+    summary = _text(row, "summary")
+    if len(summary) > 1000:
+        errors.append("summary must be at most 1000 characters")
+
+    current_bid = 0
+    if _text(row, "current_bid"):
+        try:
+            current_bid = int(_text(row, "current_bid"))
+            if current_bid < 0:
+                raise ValueError
+        except ValueError:
+            errors.append("current_bid must be a whole number of at least 0")
+
+    window = {}
+    for field in ("bidding_starts_at", "bidding_ends_at"):
+        value = _text(row, field)
+        if not value:
+            continue
+        try:
+            window[field] = _parse_local_time(value, local_tz)
+        except ValueError:
+            errors.append(f"{field} must look like YYYY-MM-DD HH:MM (HKT)")
+    starts_at = window.get("bidding_starts_at") or datetime.now(timezone.utc)
+    ends_at = window.get("bidding_ends_at")
+    if ends_at and ends_at <= starts_at:
+        errors.append("bidding_ends_at must be after bidding_starts_at")
+
+    images = row.get("images") or []
+    if isinstance(images, str):
+        images = images.split(";")
+    image_names = [os.path.basename(str(image).strip()) for image in images if str(image).strip()]
+    for image_name in image_names:
+        if image_name.rsplit(".", 1)[-1].lower() not in IMPORT_IMAGE_EXTENSIONS:
+            errors.append(f"{image_name}: only JPG, PNG, GIF, or WEBP files are supported")
+
+    lion_document = {
+        "name": name,
+        "house": _text(row, "house") or None,
+        "summary": summary,
+        "current_bid": current_bid,
+        "bidding_starts_at": starts_at,
+        "bidding_ends_at": ends_at,
+    }
+    return lion_document, image_names, errors
+
+
+def _archive_members(archive: Optional[zipfile.ZipFile]) -> dict:
+    if archive is None:
+        return {}
+    members = {}
+    for info in archive.infolist():
+        if info.is_dir() or info.filename.startswith("__MACOSX/"):
+            continue
+        members[os.path.basename(info.filename)] = info
+    return members
+
+
+def _fresh_upload(image_name: str, content: bytes, source_sha256: str, compress_options: tuple) -> dict:
+    compressed, content_type, extension = compress_image(content, *compress_options)
+    return {
+        "filename": f"{os.path.splitext(image_name)[0]}.{extension}",
+        "content": compressed,
+        "content_type": content_type,
+        "source_sha256": source_sha256,
+    }
+
+
+def _discard_lion(lion_id: str, error: str) -> str:
+    """Remove a lion whose images failed to save; returns the row error to report."""
+    try:
+        delete_lion(lion_id)
+    except Exception:
+        return f"{error}; the lion was created without them, check the dashboard"
+    return error
+
+
+def import_lions(
+    rows: List[dict],
+    archive: Optional[zipfile.ZipFile],
+    local_tz: tzinfo,
+    compress_options: tuple,
+    workers: int = LION_IMPORT_WORKERS,
+) -> Iterator[dict]:
+    """Import ``rows`` and yield progress events as dicts.
+
+    ``compress_options`` is ``(max_dim, quality, effort)`` for
+    :func:`media.compress_image`. Events have an ``event`` key of ``row``
+    (a row failed), ``image`` (compression progress), ``lion`` (a lion was
+    created) or ``done`` (final counts).
+    """
+    members = _archive_members(archive)
+    failed: dict[int, List[str]] = {}
+    valid: List[tuple[int, dict, List[str]]] = []
+    for number, row in enumerate(rows, start=1):
+        lion_document, image_names, errors = validate_lion_row(row, local_tz)
+        for image_name in image_names:
+            info = members.get(image_name)
+            if info is None:
+                errors.append(f"{image_name}: not found in the image zip")
+            elif info.file_size > MAX_IMPORT_IMAGE_BYTES:
+                errors.append(f"{image_name}: larger than {MAX_IMPORT_IMAGE_BYTES // (1024 * 1024)} MB")
+        if errors:
+            failed[number] = errors
+            yield {"event": "row", "row": number, "name": lion_document["name"], "errors": errors}
+        else:
+            valid.append((number, lion_document, image_names))
+
+    # Compress each distinct image once; images already stored are reused.
+    image_hashes: dict[str, str] = {}
+    image_errors: dict[str, str] = {}
+    prepared: dict[str, dict] = {}
+    pending: dict[str, bytes] = {}
+    for _, _, image_names in valid:
+        for image_name in image_names:
+            if image_name in image_hashes:
+                continue
+            try:
+                content = archive.read(members[image_name])
+            except (zipfile.BadZipFile, OSError, RuntimeError):
+                image_hashes[image_name] = f"unreadable:{image_name}"
+                image_errors[image_hashes[image_name]] = f"{image_name}: could not be extracted from the zip"
+                continue
+            source_sha256 = hashlib.sha256(content).hexdigest()
+            image_hashes[image_name] = source_sha256
+            if source_sha256 in prepared or source_sha256 in pending:
+                continue
+            try:
+                existing_id = find_lion_image_by_hash(source_sha256)
+            except Exception:
+                # Storing a second copy beats failing the row on a lookup.
+                existing_id = None
+            if existing_id is not None:
+                prepared[source_sha256] = {
+                    "existing_id": existing_id,
+                    "source_sha256": source_sha256,
+                    "fresh_copy": partial(_fresh_upload, image_name, content, source_sha256, compress_options),
+                }
+            else:
+                pending[source_sha256] = content
+
+    if pending:
+        names_by_hash = {}
+        for image_name, source_sha256 in image_hashes.items():
+            names_by_hash.setdefault(source_sha256, image_name)
+        # spawn keeps the pool from inheriting the parent's MongoDB sockets.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max(1, min(workers, len(pending))), mp_context=context) as pool:
+            futures = {
+                pool.submit(compress_image, content, *compress_options): source_sha256
+                for source_sha256, content in pending.items()
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                source_sha256 = futures[future]
+                image_name = names_by_hash[source_sha256]
+                try:
+                    compressed, content_type, extension = future.result()
+                except Exception as exc:
+                    image_errors[source_sha256] = f"{image_name}: could not be read as an image ({exc.__class__.__name__})"
+                else:
+                    prepared[source_sha256] = {
+                        "filename": f"{os.path.splitext(image_name)[0]}.{extension}",
+                        "content": compressed,
+                        "content_type": content_type,
+                        "source_sha256": source_sha256,
+                    }
+                yield {"event": "image", "done": done, "total": len(pending), "name": image_name}
+
+    ready = []
+    for number, lion_document, image_names in valid:
+        errors = [image_errors[image_hashes[name]] for name in image_names if image_hashes[name] in image_errors]
+        if errors:
+            failed[number] = errors
+            yield {"event": "row", "row": number, "name": lion_document["name"], "errors": errors}
+            continue
+        timestamp = datetime.now(timezone.utc)
+        lion_document.update(created_at=timestamp, updated_at=timestamp, image_ids=[])
+        ready.append((number, lion_document, image_names))
+
+    insert_error = "could not be saved to the database"
+    try:
+        inserted_ids = set(insert_lions([lion_document for _, lion_document, _ in ready])) if ready else set()
+    except Exception as exc:
+        # Without a result we cannot tell which lions were stored, so report every row.
+        inserted_ids = set()
+        insert_error = f"could not be saved to the database ({exc.__class__.__name__})"
+    imported = 0
+    stored_ids: dict[str, ObjectId] = {}
+    for number, lion_document, image_names in ready:
+        lion_id = str(lion_document.get("_id"))
+        if lion_id not in inserted_ids:
+            failed[number] = [insert_error]
+            yield {"event": "row", "row": number, "name": lion_document["name"], "errors": failed[number]}
+            continue
+        uploads = []
+        for source_sha256 in dict.fromkeys(image_hashes[name] for name in image_names):
+            upload = prepared[source_sha256]
+            if source_sha256 in stored_ids:
+                fresh_copy = upload.get("fresh_copy") or partial(dict, upload)
+                upload = {"existing_id": stored_ids[source_sha256], "source_sha256": source_sha256, "fresh_copy": fresh_copy}
+            uploads.append(upload)
+        try:
+            image_ids = add_lion_images(lion_id, uploads) if uploads else []
+        except Exception as exc:
+            failed[number] = [_discard_lion(lion_id, f"images could not be saved ({exc.__class__.__name__})")]
+            yield {"event": "row", "row": number, "name": lion_document["name"], "errors": failed[number]}
+            continue
+        for upload, image_id in zip(uploads, image_ids):
+            stored_ids.setdefault(upload["source_sha256"], upload.get("existing_id") or ObjectId(image_id))
+        imported += 1
+        yield {"event": "lion", "row": number, "name": lion_document["name"], "id": lion_id, "images": len(uploads)}
+
+    yield {"event": "done", "imported": imported, "failed": len(failed), "total": len(rows)}
+
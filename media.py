@@ -0,0 +1,123 @@
+"""QR, PDF and image helpers with lazily imported backends.
+
+WeasyPrint, qrcode and Pillow are only needed by the admin QR/PDF routes and
+the image upload path, so they are imported on first use rather than when a
+worker boots.
+"""
+
+import io
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _weasyprint_html():
+    from weasyprint import HTML
+
+    return HTML
+
+
+@lru_cache(maxsize=None)
+def _qrcode():
+    import qrcode
+
+    return qrcode
+
+
+@lru_cache(maxsize=None)
+def _pil_image():
+    from PIL import Image
+
+    return Image
+
+
+QR_FILL_COLOR = "#0F172A"
+
+
+@lru_cache(maxsize=None)
+def _qr_svg_factory():
+    from qrcode.image.svg import SvgPathImage
+
+    class LionQrSvgImage(SvgPathImage):
+        QR_PATH_STYLE = {**SvgPathImage.QR_PATH_STYLE, "fill": QR_FILL_COLOR}
+
+        def process(self):
+            # One rectangle per run of dark modules instead of one per module
+            # keeps the path (and the PDF content stream) several times smaller.
+            subpaths = []
+            for row, cells in enumerate(self.modules):
+                column = 0
+                while column < len(cells):
+                    if not cells[column]:
+                        column += 1
+                        continue
+                    start = column
+                    while column < len(cells) and cells[column]:
+                        column += 1
+                    subpaths.append(f"M{start + self.border},{row + self.border}h{column - start}v1h{start - column}z")
+            self._subpaths = subpaths
+            super().process()
+
+    return LionQrSvgImage
+
+
+def _build_qr(data: str, box_size: int, border: int):
+    qrcode = _qrcode()
+    from qrcode.constants import ERROR_CORRECT_Q
+
+    qr = qrcode.QRCode(
+        version=None,
+        error_correction=ERROR_CORRECT_Q,
+        box_size=box_size,
+        border=border,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr
+
+
+def render_qr_png(data: str, box_size: int = 10, border: int = 2) -> bytes:
+    """Encode ``data`` as a PNG QR code using error correction level Q."""
+    image = _build_qr(data, box_size, border).make_image(fill_color=QR_FILL_COLOR, back_color="white")
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def render_qr_svg(data: str, border: int = 2) -> str:
+    """Encode ``data`` as an inline SVG QR code (a single vector path, level Q)."""
+    image = _build_qr(data, 10, border).make_image(image_factory=_qr_svg_factory())
+    return image.to_string(encoding="unicode")
+
+
+def render_pdf(html: str) -> bytes:
+    return _weasyprint_html()(string=html, base_url=None).write_pdf()
+
+
+def compress_image(content: bytes, max_dim: int, quality: int, effort: int = 6) -> tuple[bytes, str, str]:
+    """Compress uploaded images and return (content, content_type, extension).
+
+    A still WebP that already fits within ``max_dim`` and carries no EXIF or
+    XMP metadata (typically produced by the browser-side compression) is
+    returned unchanged; anything else is re-encoded, which drops uploader
+    metadata such as GPS coordinates. Large JPEGs are
+    decoded with DCT scaling straight to roughly ``max_dim`` instead of at
+    full resolution. ``effort`` is the WebP encoder ``method`` (0 fastest, 6
+    smallest).
+    """
+    Image = _pil_image()
+    with Image.open(io.BytesIO(content)) as img:
+        if (
+            img.format == "WEBP"
+            and not getattr(img, "is_animated", False)
+            and max(img.size) <= max_dim
+            and not img.info.get("exif")
+            and not img.info.get("xmp")
+        ):
+            return content, "image/webp", "webp"
+        if img.format == "JPEG":
+            img.draft("RGB", (max_dim, max_dim))
+        img = img.convert("RGB")
+        img.thumbnail((max_dim, max_dim))
+        buffer = io.BytesIO()
+        img.save(buffer, format="WEBP", quality=quality, optimize=True, method=effort)
+    return buffer.getvalue(), "image/webp", "webp"
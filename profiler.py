@@ -0,0 +1,121 @@
+"""Opt-in request profiling written to a local directory.
+
+Requests are profiled when their endpoint is listed in ``PROFILE_ENDPOINTS``,
+when they fall within ``PROFILE_SAMPLE_RATE``, or on demand by a signed-in
+admin adding ``?profile=1``. ``PROFILE_FORMAT=pstats`` records a cProfile
+dump for ``pstats``/snakeviz; ``collapsed`` runs a statistical stack sampler
+and writes flamegraph-ready collapsed stacks. With sampling off, the only
+per-request cost is the ``should_sample`` check.
+"""
+
+import cProfile
+import logging
+import os
+import random
+import sys
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_ENDPOINTS = frozenset(
+    name.strip() for name in os.environ.get("PROFILE_ENDPOINTS", "").split(",") if name.strip()
+)
+PROFILE_FORMAT = os.environ.get("PROFILE_FORMAT", "pstats")
+PROFILE_SAMPLE_INTERVAL_MS = float(os.environ.get("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+
+
+class StackSampler:
+    """Record one thread's Python stack every ``interval`` seconds from a helper thread."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}")
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def write(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as handle:
+            for stack, count in self.stacks.most_common():
+                handle.write(f"{stack} {count}\n")
+
+
+Profile = Union[cProfile.Profile, StackSampler]
+
+
+class RequestProfiler:
+    def __init__(
+        self,
+        directory: str = PROFILE_DIR,
+        sample_rate: float = PROFILE_SAMPLE_RATE,
+        endpoints: frozenset = PROFILE_ENDPOINTS,
+        output_format: str = PROFILE_FORMAT,
+        sample_interval_ms: float = PROFILE_SAMPLE_INTERVAL_MS,
+    ):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.endpoints = endpoints
+        self.output_format = output_format
+        self.sample_interval = sample_interval_ms / 1000
+
+    def should_sample(self, endpoint: Optional[str]) -> bool:
+        if endpoint in self.endpoints:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self) -> Optional[Profile]:
+        """Start profiling the current thread; returns None if another profiler is active."""
+        if self.output_format == "collapsed":
+            sampler = StackSampler(threading.get_ident(), self.sample_interval)
+            sampler.start()
+            return sampler
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return None
+        return profile
+
+    def finish(self, profile: Profile, label: str) -> Optional[str]:
+        """Stop ``profile`` and write it under ``directory``; returns the file path."""
+        if isinstance(profile, StackSampler):
+            profile.stop()
+            extension = "collapsed"
+        else:
+            profile.disable()
+            extension = "pstats"
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+        path = os.path.join(self.directory, f"{stamp}-{label}-{os.getpid()}.{extension}")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if isinstance(profile, StackSampler):
+                profile.write(path)
+            else:
+                profile.dump_stats(path)
+        except OSError:
+            logger.exception("Could not write profile to %s", path)
+            return None
+        return path
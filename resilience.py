@@ -0,0 +1,111 @@
+"""Circuit breaker and last-known-good snapshots for MongoDB reads.
+
+When MongoDB stops answering, the breaker opens after a few consecutive
+connection failures so later calls fail immediately instead of each waiting
+for a server-selection timeout. Public reads then fall back to the last
+result persisted under ``MONGODB_SNAPSHOT_DIR``.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable
+
+from bson import json_util
+from bson.json_util import JSONMode, JSONOptions
+
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("MONGODB_CIRCUIT_FAILURE_THRESHOLD", "3"))
+CIRCUIT_RESET_SECONDS = float(os.environ.get("MONGODB_CIRCUIT_RESET_SECONDS", "15"))
+SNAPSHOT_DIR = os.environ.get(
+    "MONGODB_SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".snapshots")
+)
+SNAPSHOT_REFRESH_SECONDS = float(os.environ.get("MONGODB_SNAPSHOT_REFRESH_SECONDS", "30"))
+
+# Canonical extended JSON keeps ObjectIds, datetimes and int/float types intact.
+_SNAPSHOT_JSON_OPTIONS = JSONOptions(json_mode=JSONMode.CANONICAL)
+
+
+class CircuitOpenError(Exception):
+    """Raised without touching the database while the circuit is open."""
+
+
+class CircuitBreaker:
+    """Closed -> open after ``failure_threshold`` consecutive failures -> one trial call after ``reset_seconds``."""
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, reset_seconds: float = CIRCUIT_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None and (
+                self._trial_running or time.monotonic() - self._opened_at < self.reset_seconds
+            )
+
+    def call(self, func: Callable, *args, failures: tuple = (Exception,), **kwargs) -> Any:
+        """Run ``func`` unless the circuit is open; exceptions in ``failures`` count towards opening it."""
+        with self._lock:
+            if self._opened_at is not None:
+                if self._trial_running or time.monotonic() - self._opened_at < self.reset_seconds:
+                    raise CircuitOpenError(func.__name__)
+                self._trial_running = True
+        try:
+            result = func(*args, **kwargs)
+        except failures:
+            with self._lock:
+                self._trial_running = False
+                self._failures += 1
+                if self._opened_at is not None or self._failures >= self.failure_threshold:
+                    self._opened_at = time.monotonic()
+            raise
+        except BaseException:
+            with self._lock:
+                self._trial_running = False
+            raise
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+        return result
+
+
+class SnapshotStore:
+    """Persist the latest result for each read key, at most once per ``refresh_seconds``."""
+
+    def __init__(self, directory: str = SNAPSHOT_DIR, refresh_seconds: float = SNAPSHOT_REFRESH_SECONDS):
+        self.directory = directory
+        self.refresh_seconds = refresh_seconds
+        self._saved_at: dict[str, float] = {}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json")
+
+    def save(self, key: str, value: Any) -> None:
+        now = time.monotonic()
+        if now - self._saved_at.get(key, float("-inf")) < self.refresh_seconds:
+            return
+        self._saved_at[key] = now
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            payload = json_util.dumps(value, json_options=_SNAPSHOT_JSON_OPTIONS)
+            # Write then rename so other workers never read a partial snapshot.
+            with tempfile.NamedTemporaryFile("w", dir=self.directory, suffix=".tmp", delete=False, encoding="utf-8") as handle:
+                handle.write(payload)
+            os.replace(handle.name, self._path(key))
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def load(self, key: str) -> tuple[bool, Any]:
+        """Return ``(found, value)`` for the last snapshot saved under ``key``."""
+        try:
+            with open(self._path(key), encoding="utf-8") as handle:
+                return True, json_util.loads(handle.read(), json_options=_SNAPSHOT_JSON_OPTIONS)
+        except (OSError, ValueError):
+            return False, None
@@ -0,0 +1,15 @@
+// Decodes QR codes off the main thread. The page first sends the jsQR URL,
+// then transfers RGBA pixel buffers in and gets each one transferred back.
+self.addEventListener('message', ({ data }) => {
+    if (data.type === 'init') {
+        importScripts(data.jsqr);
+        return;
+    }
+    const { id, width, height, buffer } = data;
+    const started = performance.now();
+    const code = jsQR(new Uint8ClampedArray(buffer), width, height, { inversionAttempts: 'dontInvert' });
+    self.postMessage(
+        { id, buffer, payload: code?.data || null, decodeMs: performance.now() - started },
+        [buffer],
+    );
+});
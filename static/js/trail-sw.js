@@ -0,0 +1,105 @@
+// Lion trail service worker.
+//
+// The trail manifest lists content-hashed URLs for everything the trail page
+// needs. Hashed assets are served cache-first and only fetched when their URL
+// is new; the page itself is network-first with the cached copy as fallback.
+
+const ASSET_CACHE = 'lion-trail-assets-v1';
+const META_CACHE  = 'lion-trail-meta-v1';
+const PARAMS = new URL(self.location).searchParams;
+const MANIFEST_URL = PARAMS.get('manifest') || '/trail/manifest.json';
+const PAGE_PATH = PARAMS.get('page') || '/trail';
+const NETWORK_TIMEOUT_MS = 4000;
+
+const absolute = (url) => new URL(url, self.location).href;
+
+const loadManifest = async () => {
+    const meta = await caches.open(META_CACHE);
+    const hit = await meta.match(MANIFEST_URL);
+    return hit ? hit.json() : null;
+};
+
+const fetchInto = async (cache, href) => {
+    try {
+        const response = await fetch(href, { credentials: 'same-origin' });
+        if (response.ok) await cache.put(href, response);
+    } catch {}
+};
+
+const sync = async () => {
+    let manifest;
+    try {
+        const response = await fetch(MANIFEST_URL, { cache: 'no-store', credentials: 'same-origin' });
+        if (!response.ok) return;
+        manifest = await response.json();
+    } catch { return; }
+
+    const previous = await loadManifest();
+    const cache = await caches.open(ASSET_CACHE);
+    const pageHref = absolute(manifest.page.url);
+    const wanted = new Set(manifest.assets.map(asset => absolute(asset.url)));
+
+    const missing = [];
+    for (const href of wanted) {
+        if (!(await cache.match(href))) missing.push(href);
+    }
+    if (previous?.page?.revision !== manifest.page.revision || !(await cache.match(pageHref))) {
+        missing.push(pageHref);
+    }
+    await Promise.all(missing.map(href => fetchInto(cache, href)));
+
+    for (const request of await cache.keys()) {
+        if (request.url !== pageHref && !wanted.has(request.url)) await cache.delete(request);
+    }
+
+    const meta = await caches.open(META_CACHE);
+    await meta.put(MANIFEST_URL, new Response(JSON.stringify(manifest), {
+        headers: { 'Content-Type': 'application/json' },
+    }));
+};
+
+const networkFirstPage = async (request) => {
+    const cache = await caches.open(ASSET_CACHE);
+    const pageHref = absolute(PAGE_PATH);
+    try {
+        const response = await Promise.race([
+            fetch(request),
+            new Promise((_, reject) => setTimeout(reject, NETWORK_TIMEOUT_MS)),
+        ]);
+        if (response.ok) await cache.put(pageHref, response.clone());
+        return response;
+    } catch {
+        return (await cache.match(pageHref)) || Response.error();
+    }
+};
+
+self.addEventListener('install', event => {
+    event.waitUntil(sync().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(self.clients.claim());
+});
+
+self.addEventListener('message', event => {
+    if (event.data?.type === 'sync') event.waitUntil(sync());
+});
+
+self.addEventListener('fetch', event => {
+    const { request } = event;
+    if (request.method !== 'GET') return;
+    const url = new URL(request.url);
+
+    if (request.mode === 'navigate') {
+        if (url.origin === self.location.origin && url.pathname === PAGE_PATH) {
+            event.respondWith(networkFirstPage(request));
+        }
+        return;
+    }
+
+    event.respondWith(
+        caches.open(ASSET_CACHE)
+            .then(cache => cache.match(request))
+            .then(hit => hit || fetch(request))
+    );
+});
@@ -0,0 +1,309 @@
+(() => {
+    const script = document.currentScript;
+    const cards = Array.from(document.querySelectorAll('[data-lion-card]'));
+    if (!cards.length) return;
+
+    // Elements
+    const scanTrigger   = document.querySelector('[data-scan-trigger]');
+    const modal         = document.querySelector('[data-scanner-modal]');
+    const overlay       = document.querySelector('[data-scanner-overlay]');
+    const closeBtn      = document.querySelector('[data-scanner-close]');
+    const videoEl       = document.querySelector('[data-scan-video]');
+    const msgEl         = document.querySelector('[data-scan-message]');
+    const countEl       = document.querySelector('[data-collected-count]');
+    const statusEl      = document.querySelector('[data-collected-status]');
+    const progressBar   = document.querySelector('[data-progress-bar]');
+
+    const STORAGE_KEY   = 'lion-trail-scans-v2';
+    const total         = cards.length;
+    const cardMap       = new Map(cards.map(c => [c.dataset.lionId, c]));
+
+    // ── Persistence ──────────────────────────────────────────────
+    const load = () => {
+        try {
+            const raw = JSON.parse(localStorage.getItem(STORAGE_KEY) || '[]');
+            return new Set(Array.isArray(raw) ? raw.filter(id => cardMap.has(id)) : []);
+        } catch { return new Set(); }
+    };
+    const save = (set) => {
+        try { localStorage.setItem(STORAGE_KEY, JSON.stringify([...set])); } catch {}
+    };
+
+    const scanned = load();
+
+    // ── Render ───────────────────────────────────────────────────
+    const render = () => {
+        const n = scanned.size;
+
+        // Counter + bar
+        if (countEl) countEl.textContent = n;
+        if (progressBar) progressBar.style.width = total ? `${(n / total) * 100}%` : '0%';
+        if (statusEl) {
+            statusEl.textContent = n === 0
+                ? 'Start scanning to track your progress.'
+                : n === total
+                ? 'All lions collected — head to the finish tent!'
+                : `${total - n} lion${total - n === 1 ? '' : 's'} left to find.`;
+        }
+
+        // Completion banner
+        const banner = document.querySelector('[data-completion-banner]');
+        if (banner) banner.classList.toggle('hidden', n < total);
+
+        // Checklist cards
+        cards.forEach(card => {
+            const done = scanned.has(card.dataset.lionId);
+            card.classList.toggle('ring-2', done);
+            card.classList.toggle('ring-emerald-300', done);
+            card.classList.toggle('bg-emerald-50/50', done);
+            const icon = card.querySelector('[data-check-icon]');
+            if (icon) {
+                icon.classList.toggle('bg-emerald-500', done);
+                icon.classList.toggle('text-white', done);
+                icon.classList.toggle('bg-slate-100', !done);
+                icon.classList.toggle('text-slate-400', !done);
+                icon.textContent = done ? '✓' : icon.dataset.num || icon.textContent;
+            }
+        });
+    };
+
+    // Store the stop number so we can restore it after un-scan (future use)
+    cards.forEach((card, i) => {
+        const icon = card.querySelector('[data-check-icon]');
+        if (icon) icon.dataset.num = String(i + 1).padStart(2, '0');
+    });
+
+    // ── QR payload parsing ───────────────────────────────────────
+    const extractId = (payload) => {
+        if (!payload) return null;
+        try {
+            const url = new URL(payload);
+            const fromHash = new URLSearchParams(url.hash.slice(1)).get('lion');
+            if (fromHash) return fromHash;
+            const fromSearch = url.searchParams.get('lion');
+            if (fromSearch) return fromSearch;
+        } catch {}
+        const hashIdx = payload.indexOf('#');
+        if (hashIdx >= 0) {
+            const p = new URLSearchParams(payload.slice(hashIdx + 1).replace(/^\?/, ''));
+            const v = p.get('lion');
+            if (v) return v;
+        }
+        if (payload.startsWith('lion=')) return payload.slice(5);
+        return null;
+    };
+
+    // ── Scanner ──────────────────────────────────────────────────
+    // Frames are decoded at most DECODE_FPS times a second, from a centre
+    // crop downscaled to DECODE_SIZE px. The native BarcodeDetector is used
+    // when available; otherwise jsQR runs in a Web Worker and the pixel buffer
+    // is transferred (not copied) to it and back.
+    const DECODE_FPS    = 8;
+    const CROP_FRACTION = 0.7;
+    const DECODE_SIZE   = 400;
+    const debug         = new URLSearchParams(location.search).has('scan-debug');
+    const debugEl       = document.querySelector('[data-scan-debug]');
+
+    const canvas = document.createElement('canvas');
+    canvas.width = canvas.height = DECODE_SIZE;
+    const ctx    = canvas.getContext('2d', { willReadFrequently: true });
+    let stream   = null;
+    let raf      = null;
+    let busy     = false;
+    let lastDecode = 0;
+    let lastHit  = { id: null, ts: 0 };
+    let engine   = null;
+    const metrics = { engine: null, frames: 0, totalMs: 0, maxMs: 0, startedAt: 0 };
+
+    const setMsg = (t) => { if (msgEl) msgEl.textContent = t; };
+
+    const reportMetrics = () => {
+        if (!debug || !debugEl || !metrics.frames) return;
+        const elapsed = (performance.now() - metrics.startedAt) / 1000;
+        debugEl.classList.remove('hidden');
+        debugEl.textContent = `${metrics.engine} · ${(metrics.frames / elapsed).toFixed(1)} decodes/s · `
+            + `avg ${(metrics.totalMs / metrics.frames).toFixed(1)} ms · max ${metrics.maxMs.toFixed(1)} ms`;
+    };
+
+    const recordDecode = (ms) => {
+        metrics.frames += 1;
+        metrics.totalMs += ms;
+        metrics.maxMs = Math.max(metrics.maxMs, ms);
+        reportMetrics();
+    };
+
+    const handlePayload = (payload) => {
+        if (!payload) return;
+        const id  = extractId(payload.trim());
+        const now = Date.now();
+        if (id && cardMap.has(id) && (id !== lastHit.id || now - lastHit.ts > 2000)) {
+            lastHit = { id, ts: now };
+            scanned.add(id);
+            save(scanned);
+            render();
+            setMsg(`✓ ${cardMap.get(id).dataset.lionName} — keep going!`);
+        }
+    };
+
+    const createDetectorEngine = async () => {
+        if (!('BarcodeDetector' in window)) return null;
+        try {
+            const formats = await BarcodeDetector.getSupportedFormats();
+            if (!formats.includes('qr_code')) return null;
+        } catch { return null; }
+        const detector = new BarcodeDetector({ formats: ['qr_code'] });
+        return {
+            name: 'BarcodeDetector',
+            decode: async () => {
+                const started = performance.now();
+                const codes = await detector.detect(canvas);
+                recordDecode(performance.now() - started);
+                return codes[0]?.rawValue || null;
+            },
+        };
+    };
+
+    const createWorkerEngine = () => {
+        if (!window.Worker || !script?.dataset.qrWorker) return null;
+        const worker = new Worker(script.dataset.qrWorker);
+        worker.postMessage({ type: 'init', jsqr: script.dataset.jsqr });
+        const pending = new Map();
+        let nextId = 0;
+        let spare = null;
+        let failed = false;
+        worker.addEventListener('message', ({ data }) => {
+            spare = data.buffer;
+            recordDecode(data.decodeMs);
+            pending.get(data.id)?.(data.payload);
+            pending.delete(data.id);
+        });
+        worker.addEventListener('error', () => {
+            failed = true;
+            pending.forEach(resolve => resolve(null));
+            pending.clear();
+            setMsg('Scanner failed to load — please refresh the page.');
+        });
+        return {
+            name: 'jsQR worker',
+            decode: () => new Promise(resolve => {
+                if (failed) { resolve(null); return; }
+                const image = ctx.getImageData(0, 0, DECODE_SIZE, DECODE_SIZE);
+                // Reuse the buffer handed back by the worker when it fits.
+                let pixels = image.data;
+                if (spare && spare.byteLength === pixels.byteLength) {
+                    const reused = new Uint8ClampedArray(spare);
+                    reused.set(pixels);
+                    pixels = reused;
+                }
+                spare = null;
+                const id = nextId++;
+                pending.set(id, resolve);
+                worker.postMessage({ id, width: DECODE_SIZE, height: DECODE_SIZE, buffer: pixels.buffer }, [pixels.buffer]);
+            }),
+        };
+    };
+
+    const stopStream = () => {
+        if (raf) { cancelAnimationFrame(raf); raf = null; }
+        if (stream) { stream.getTracks().forEach(t => t.stop()); stream = null; }
+        if (videoEl) { videoEl.pause(); videoEl.srcObject = null; }
+    };
+
+    const drawCentreCrop = () => {
+        const side = Math.min(videoEl.videoWidth, videoEl.videoHeight) * CROP_FRACTION;
+        const sx = (videoEl.videoWidth - side) / 2;
+        const sy = (videoEl.videoHeight - side) / 2;
+        ctx.drawImage(videoEl, sx, sy, side, side, 0, 0, DECODE_SIZE, DECODE_SIZE);
+    };
+
+    const loop = (now) => {
+        raf = requestAnimationFrame(loop);
+        if (busy || !engine || now - lastDecode < 1000 / DECODE_FPS) return;
+        if (!videoEl || videoEl.readyState < 2 || !videoEl.videoWidth) return;
+        lastDecode = now;
+        busy = true;
+        drawCentreCrop();
+        engine.decode()
+            .then(handlePayload)
+            .catch(() => {})
+            .finally(() => { busy = false; });
+    };
+
+    const startScanner = async () => {
+        if (!navigator.mediaDevices?.getUserMedia) {
+            setMsg('Camera not supported in this browser.'); return;
+        }
+        engine = engine || await createDetectorEngine() || createWorkerEngine();
+        if (!engine) {
+            setMsg('Scanner failed to load — please refresh the page.'); return;
+        }
+        try {
+            stream = await navigator.mediaDevices.getUserMedia({ video: { facingMode: 'environment' } });
+        } catch {
+            setMsg('Camera access denied. Allow camera permission and try again.'); return;
+        }
+        videoEl.srcObject = stream;
+        videoEl.play();
+        lastHit = { id: null, ts: 0 };
+        Object.assign(metrics, { engine: engine.name, frames: 0, totalMs: 0, maxMs: 0, startedAt: performance.now() });
+        setMsg('Centre the QR code in the frame.');
+        raf = requestAnimationFrame(loop);
+    };
+
+    // ── Modal ────────────────────────────────────────────────────
+    const isOpen = () => modal && !modal.classList.contains('hidden');
+
+    const openModal = () => {
+        if (!modal) return;
+        modal.classList.remove('hidden');
+        document.body.classList.add('overflow-hidden');
+        setMsg('Initializing camera…');
+        startScanner();
+    };
+
+    const closeModal = () => {
+        if (!modal) return;
+        modal.classList.add('hidden');
+        document.body.classList.remove('overflow-hidden');
+        stopStream();
+        setMsg('Initializing camera…');
+    };
+
+    scanTrigger?.addEventListener('click', openModal);
+    closeBtn?.addEventListener('click', closeModal);
+    overlay?.addEventListener('click', closeModal);
+    document.addEventListener('keydown', e => { if (e.key === 'Escape' && isOpen()) closeModal(); });
+    document.addEventListener('visibilitychange', () => { if (document.hidden && isOpen()) closeModal(); });
+
+    render();
+})();
+
+// Map lightbox
+(() => {
+    const lightbox = document.getElementById('map-lightbox');
+    const overlay  = document.getElementById('map-lightbox-overlay');
+    const closeBtn = document.getElementById('map-lightbox-close');
+    const mapImg   = document.getElementById('trail-map-img');
+    const enlargeBtn = document.getElementById('map-enlarge-btn');
+    const open  = () => { lightbox?.classList.remove('hidden'); document.body.classList.add('overflow-hidden'); };
+    const close = () => { lightbox?.classList.add('hidden'); document.body.classList.remove('overflow-hidden'); };
+    enlargeBtn?.addEventListener('click', open);
+    mapImg?.addEventListener('click', open);
+    closeBtn?.addEventListener('click', close);
+    overlay?.addEventListener('click', close);
+    document.addEventListener('keydown', e => { if (e.key === 'Escape') close(); });
+})();
+
+// Offline support: the service worker precaches everything listed in the
+// trail manifest and re-downloads only assets whose hashed URL has changed.
+(() => {
+    const script = document.currentScript;
+    if (!('serviceWorker' in navigator) || !script?.dataset.serviceWorker) return;
+    navigator.serviceWorker
+        .register(script.dataset.serviceWorker, { scope: script.dataset.serviceWorkerScope })
+        .then(registration => {
+            const worker = registration.active;
+            if (worker && navigator.onLine) worker.postMessage({ type: 'sync' });
+        })
+        .catch(() => {});
+})();